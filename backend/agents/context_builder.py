@@ -0,0 +1,151 @@
+"""
+Context builder — relevance-ranked, token-budgeted graph context for reasoning prompts.
+Edges are scored by entity mentions in the question, hop distance from those
+entities and relationship-type weight, then packed into a compact notation
+(one line per source and relationship) until the token budget is spent.
+"""
+import math
+import re
+from collections import defaultdict, deque
+from config import settings
+from graph.graph_queries import get_subgraph
+from graph.read_cache import cached_read
+from agents.llm_cache import normalize_text
+
+RELATIONSHIP_WEIGHTS = {
+    "COMPETES_WITH": 1.0,
+    "INVESTS_IN": 0.9,
+    "PARTNERS_WITH": 0.8,
+    "USES": 0.7,
+    "OFFERS": 0.7,
+    "OPERATES_IN": 0.4,
+}
+DEFAULT_WEIGHT = 0.5
+MAX_MENTION_WORDS = 4
+
+_TOKEN = re.compile(r"[\w.&'-]+")
+
+
+class _GraphIndex:
+    """Adjacency, name lookup and per-edge incidence for one graph version."""
+
+    def __init__(self, graph_data: dict):
+        self.labels = {n["name"]: n["label"] for n in graph_data.get("nodes", [])}
+        self.edges = [(e["source"], e["relationship"], e["target"]) for e in graph_data.get("edges", [])]
+        self.by_lower = {name.lower(): name for name in self.labels}
+        self.incident: dict[str, list[int]] = defaultdict(list)
+        for i, (src, _, tgt) in enumerate(self.edges):
+            self.incident[src].append(i)
+            if tgt != src:
+                self.incident[tgt].append(i)
+        self._hub_ranking: list[int] | None = None
+
+    def mentions(self, question: str) -> list[str]:
+        """Node names that appear in *question*, matched on word n-grams."""
+        words = [w.strip(".'-").lower() for w in _TOKEN.findall(question)]
+        found = []
+        for size in range(MAX_MENTION_WORDS, 0, -1):
+            for i in range(len(words) - size + 1):
+                name = self.by_lower.get(" ".join(words[i:i + size]))
+                if name and name not in found:
+                    found.append(name)
+        return found
+
+    def distances(self, seeds: list[str], hops: int) -> dict[str, int]:
+        dist = {s: 0 for s in seeds if s in self.labels}
+        queue = deque(dist)
+        while queue:
+            node = queue.popleft()
+            if dist[node] >= hops:
+                continue
+            for i in self.incident.get(node, ()):
+                src, _, tgt = self.edges[i]
+                other = tgt if src == node else src
+                if other not in dist:
+                    dist[other] = dist[node] + 1
+                    queue.append(other)
+        return dist
+
+    def hub_ranking(self) -> list[int]:
+        """Edges ranked by relationship weight and endpoint degree, for questions with no mentions."""
+        if self._hub_ranking is None:
+            def score(i):
+                src, rel, tgt = self.edges[i]
+                degree = len(self.incident[src]) + len(self.incident[tgt])
+                return RELATIONSHIP_WEIGHTS.get(rel, DEFAULT_WEIGHT) * math.log1p(degree)
+            self._hub_ranking = sorted(range(len(self.edges)), key=score, reverse=True)
+        return self._hub_ranking
+
+
+@cached_read
+async def _graph_index(company: str | None) -> _GraphIndex:
+    return _GraphIndex(await get_subgraph(company))
+
+
+def _rank_edges(index: _GraphIndex, seeds: list[str], mentioned: set[str], hops: int) -> list[int]:
+    dist = index.distances(seeds, hops)
+    if not dist:
+        return index.hub_ranking()
+    candidates = {i for node, d in dist.items() if d < hops for i in index.incident.get(node, ())}
+
+    def score(i):
+        src, rel, tgt = index.edges[i]
+        nearest = min(dist.get(src, hops), dist.get(tgt, hops))
+        value = RELATIONSHIP_WEIGHTS.get(rel, DEFAULT_WEIGHT) / (1 + nearest)
+        if src in mentioned and tgt in mentioned:
+            value += 1.0  # facts linking two entities from the question matter most
+        return value
+
+    return sorted(candidates, key=lambda i: (-score(i), index.edges[i]))
+
+
+def _pack(index: _GraphIndex, ranked: list[int], budget: int) -> str:
+    """Greedily add the highest-ranked edges until the token budget is spent."""
+    groups: dict[tuple[str, str], list[str]] = {}
+    entities: dict[str, set[str]] = defaultdict(set)
+    seen: set[str] = set()
+    chars = 0
+    limit = budget * 4  # same ~4 characters per token as estimate_tokens
+    for i in ranked:
+        src, rel, tgt = index.edges[i]
+        cost = len(tgt) + 2 if (src, rel) in groups else len(src) + len(rel) + len(tgt) + 10
+        cost += sum(len(n) + 2 for n in (src, tgt) if n not in seen)
+        if chars + cost > limit:
+            break
+        chars += cost
+        groups.setdefault((src, rel), []).append(tgt)
+        for n in (src, tgt):
+            if n not in seen:
+                seen.add(n)
+                entities[index.labels.get(n, "")].add(n)
+
+    lines = ["Knowledge Graph Context (most relevant facts first):", "", "Entities:"]
+    for label in sorted(entities):
+        lines.append(f"  {label or 'Unknown'}: {', '.join(sorted(entities[label]))}")
+    lines.append("\nRelationships:")
+    for (src, rel), targets in groups.items():
+        lines.append(f"  ({src}) -[{rel}]-> ({', '.join(targets)})")
+    selected = sum(len(t) for t in groups.values())
+    if selected < len(ranked):
+        lines.append(f"\n({len(ranked) - selected} lower-relevance relationships omitted)")
+    return "\n".join(lines)
+
+
+@cached_read
+async def _cached_context(question: str, company: str | None, budget: int, hops: int) -> str:
+    index = await _graph_index(company)
+    mentioned = index.mentions(question)
+    seeds = ([company] if company else []) + mentioned
+    ranked = _rank_edges(index, seeds, set(mentioned), hops)
+    return _pack(index, ranked, budget)
+
+
+async def build_context(question: str, company: str | None = None, budget: int | None = None) -> str:
+    """Graph context for *question*, at most ~*budget* tokens. Cached per graph version."""
+    return await _cached_context(
+        normalize_text(question),
+        company,
+        budget or settings.REASONING_CONTEXT_TOKENS,
+        settings.REASONING_CONTEXT_HOPS,
+    )
+
@@ -1,19 +1,85 @@
 """
 Crawler Agent — invokes MCP tools to gather news and IR data for each company.
+Companies are crawled concurrently under a global limit, with a per-host limit
+so the same IR site or search endpoint is not hit by every company at once.
+Each source has its own deadline, which starts once its host has a free slot,
+and the company as a whole has an overall deadline covering the wait for slots.
 """
+import asyncio
 import logging
+from typing import Awaitable, Callable
+from urllib.parse import urlparse
+from config import settings
 from tools.mcp_server import crawl_company_news, crawl_investor_relations, financial_extractor
+from tools.ir_scraper import IR_URLS
+from tools.web_search_tool import SEARCH_URL
 
 logger = logging.getLogger(__name__)
 
+_SEARCH_HOST = urlparse(SEARCH_URL).netloc
+_host_limits: dict[str, asyncio.Semaphore] = {}
 
-async def crawl_company(company: str) -> dict:
-    """Crawl all data sources for a single company. Returns combined raw data."""
+
+def _host_limit(url: str) -> asyncio.Semaphore | None:
+    """Semaphore for *url*'s host, or None for sources that make no request."""
+    host = urlparse(url).netloc
+    if not host:
+        return None
+    if host not in _host_limits:
+        # Every company's news goes to the one search host, so it gets a wider limit
+        limit = settings.CRAWL_SEARCH_HOST_LIMIT if host == _SEARCH_HOST else settings.CRAWL_PER_HOST_LIMIT
+        _host_limits[host] = asyncio.Semaphore(limit)
+    return _host_limits[host]
+
+
+async def _fetch(url: str, fetch: Callable[[], Awaitable], timeout: float):
+    """Run one source under its host limit, with *timeout* counted from when a slot is free."""
+    limit = _host_limit(url)
+    if limit is None:
+        return await asyncio.wait_for(fetch(), timeout)
+    async with limit:
+        return await asyncio.wait_for(fetch(), timeout)
+
+
+async def crawl_company(company: str, timeout: float | None = None) -> dict:
+    """Crawl all data sources for a single company. Returns combined raw data.
+
+    News, IR and financials are fetched concurrently, each under
+    CRAWL_SOURCE_TIMEOUT, and the company under *timeout* (CRAWL_COMPANY_TIMEOUT)
+    overall. Sources that fail or miss a deadline are left empty and reported
+    under ``errors``.
+    """
     logger.info("Crawling data for %s", company)
+    timeout = timeout or settings.CRAWL_COMPANY_TIMEOUT
+    source_timeout = settings.CRAWL_SOURCE_TIMEOUT
 
-    news = await crawl_company_news(company)
-    ir = await crawl_investor_relations(company)
-    financials = await financial_extractor(company)
+    tasks = {
+        "news": asyncio.create_task(_fetch(SEARCH_URL, lambda: crawl_company_news(company), source_timeout)),
+        "ir": asyncio.create_task(_fetch(IR_URLS.get(company, ""), lambda: crawl_investor_relations(company), source_timeout)),
+        "financials": asyncio.create_task(_fetch("", lambda: financial_extractor(company), source_timeout)),
+    }
+    _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+
+    sources, errors = {}, {}
+    for name, task in tasks.items():
+        if task.cancelled():
+            errors[name] = f"timed out after {timeout}s"
+        elif isinstance(task.exception(), TimeoutError):
+            errors[name] = f"timed out after {source_timeout}s"
+        elif task.exception():
+            errors[name] = str(task.exception())
+        else:
+            sources[name] = task.result()
+    if errors:
+        logger.warning("Partial crawl for %s: %s", company, errors)
+
+    news = sources.get("news", [])
+    ir = sources.get("ir", {})
+    financials = sources.get("financials", {})
 
     # Combine into a single text block for extraction
     news_text = "\n".join(
@@ -43,13 +109,23 @@ YoY Growth: {financials.get('yoy_growth', 'N/A')}
         "news": news,
         "ir": ir,
         "financials": financials,
+        "errors": errors,
     }
 
 
-async def crawl_cohort(companies: list[str]) -> list[dict]:
-    """Crawl all companies in the cohort."""
-    results = []
-    for company in companies:
-        data = await crawl_company(company)
-        results.append(data)
-    return results
+async def crawl_cohort(companies: list[str], concurrency: int | None = None,
+                       on_result: Callable[[dict], Awaitable] | None = None) -> list[dict]:
+    """Crawl all companies in the cohort concurrently. Results keep cohort order.
+
+    *on_result* is awaited with each company's data as soon as it finishes.
+    """
+    limit = asyncio.Semaphore(concurrency or settings.CRAWL_CONCURRENCY)
+
+    async def _crawl(company: str) -> dict:
+        async with limit:
+            data = await crawl_company(company)
+        if on_result:
+            await on_result(data)
+        return data
+
+    return await asyncio.gather(*(_crawl(c) for c in companies))
@@ -0,0 +1,72 @@
+"""
+Extraction store — last known crawl fingerprint, extraction and triples per company.
+Lets incremental pipeline runs skip companies whose sources have not changed.
+"""
+import json
+import os
+import sqlite3
+import time
+from config import settings
+from tools.disk_cache import DiskCache
+from agents.llm_cache import text_hash
+
+
+def extraction_fingerprint(raw_text: str, *scope) -> str:
+    """Fingerprint of the crawled text plus whatever else shapes the extraction (model, prompt)."""
+    return DiskCache.key(*scope, text_hash(raw_text))
+
+
+class ExtractionStore:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS companies (
+                company TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                extraction TEXT NOT NULL,
+                triples TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get(self, company: str) -> dict | None:
+        row = self._db.execute("SELECT * FROM companies WHERE company = ?", (company,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "company": row["company"],
+            "fingerprint": row["fingerprint"],
+            "extraction": json.loads(row["extraction"]),
+            "triples": [tuple(t) for t in json.loads(row["triples"])],
+            "updated_at": row["updated_at"],
+        }
+
+    def put(self, company: str, fingerprint: str, extraction: dict, triples: list[tuple]):
+        self._db.execute(
+            "INSERT OR REPLACE INTO companies (company, fingerprint, extraction, triples, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (company, fingerprint, json.dumps(extraction), json.dumps(sorted(triples)), time.time()),
+        )
+        self._db.commit()
+
+    def all(self) -> list[dict]:
+        rows = self._db.execute("SELECT company FROM companies ORDER BY company").fetchall()
+        return [self.get(r["company"]) for r in rows]
+
+    def rows(self):
+        """Yield one (company, category, value, details) row per extracted item, for tabular exports."""
+        for record in self.all():
+            for category, values in record["extraction"].items():
+                if category == "company" or not isinstance(values, list):
+                    continue
+                for value in values:
+                    if isinstance(value, dict):
+                        yield record["company"], category, value.get("target", ""), json.dumps(value)
+                    else:
+                        yield record["company"], category, value, ""
+
+
+extraction_store = ExtractionStore(settings.EXTRACTION_STORE_PATH)
@@ -4,11 +4,17 @@ Produces structured JSON for graph insertion.
 """
 import json
 import logging
-from config import settings
 from prompts.extraction_prompt import EXTRACTION_SYSTEM_PROMPT, EXTRACTION_USER_PROMPT
+from agents.llm_cache import extraction_cache, prompt_version, estimate_tokens
+from agents.llm_provider import llm_provider
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_PROMPT_VERSION = prompt_version(EXTRACTION_SYSTEM_PROMPT, EXTRACTION_USER_PROMPT)
+
+# Relationship types owned by extraction — incremental runs diff these per company
+EXTRACTED_RELATIONSHIPS = ["OFFERS", "PARTNERS_WITH", "OPERATES_IN", "INVESTS_IN"]
+
 # ------------------------------------------------------------------ Demo data
 DEMO_EXTRACTIONS = {
     "Infosys": {
@@ -73,32 +79,37 @@ DEMO_EXTRACTIONS = {
 
 async def extract_entities(company: str, raw_text: str) -> dict:
     """Extract structured entities from raw text using LLM (or demo fallback)."""
-    is_ollama = settings.LLM_PROVIDER == "ollama"
-    if settings.DEMO_MODE or (not is_ollama and not settings.OPENAI_API_KEY and not settings.GEMINI_API_KEY):
+    extraction, _ = await extract_entities_live(company, raw_text)
+    return extraction
+
+
+async def extract_entities_live(company: str, raw_text: str) -> tuple[dict, bool]:
+    """Like extract_entities, but also report whether the result came from the LLM.
+
+    The flag is False for demo data — returned when the LLM is disabled or fails —
+    so callers can avoid persisting it as if it were a real extraction.
+    """
+    if not llm_provider.is_enabled:
         logger.info("Using demo extraction for %s", company)
-        return DEMO_EXTRACTIONS.get(company, {"company": company, "offerings": [], "ai_brands": [], "cloud_brands": [], "partnerships": [], "geographic_expansion": [], "investments": []})
+        return DEMO_EXTRACTIONS.get(company, {"company": company, "offerings": [], "ai_brands": [], "cloud_brands": [], "partnerships": [], "geographic_expansion": [], "investments": []}), False
 
-    try:
-        if settings.LLM_PROVIDER == "openai" and settings.OPENAI_API_KEY:
-            from langchain_openai import ChatOpenAI
-            llm = ChatOpenAI(model="gpt-4o", temperature=0, api_key=settings.OPENAI_API_KEY)
-        elif settings.LLM_PROVIDER == "ollama":
-            from langchain_ollama import ChatOllama
-            llm = ChatOllama(base_url=settings.OLLAMA_BASE_URL, model=settings.OLLAMA_MODEL, temperature=0)
-        else:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0, google_api_key=settings.GEMINI_API_KEY)
+    scope = (llm_provider.provider, llm_provider.model_name, EXTRACTION_PROMPT_VERSION, company)
+    cached = extraction_cache.lookup(scope, raw_text)
+    if cached is not None:
+        logger.info("Extraction cache hit for %s", company)
+        return cached, True
 
-        from langchain_core.messages import SystemMessage, HumanMessage
-        messages = [
-            SystemMessage(content=EXTRACTION_SYSTEM_PROMPT),
-            HumanMessage(content=EXTRACTION_USER_PROMPT.format(company=company, text=raw_text)),
-        ]
-        response = await llm.ainvoke(messages)
-        return json.loads(response.content)
+    try:
+        user_prompt = EXTRACTION_USER_PROMPT.format(company=company, text=raw_text)
+        response = await llm_provider.ainvoke(llm_provider.messages(EXTRACTION_SYSTEM_PROMPT, user_prompt))
+        extraction = json.loads(response.content)
+        usage = getattr(response, "usage_metadata", None) or {}
+        tokens = usage.get("total_tokens") or estimate_tokens(EXTRACTION_SYSTEM_PROMPT + user_prompt + response.content)
+        extraction_cache.store_result(scope, raw_text, extraction, tokens)
+        return extraction, True
     except Exception as exc:
         logger.error("LLM extraction failed for %s: %s", company, exc)
-        return DEMO_EXTRACTIONS.get(company, {"company": company, "offerings": []})
+        return DEMO_EXTRACTIONS.get(company, {"company": company, "offerings": []}), False
 
 
 def entities_to_triples(extraction: dict) -> list[tuple]:
@@ -0,0 +1,218 @@
+"""
+Job queue — runs pipeline requests as background jobs on a bounded worker pool.
+Job state is persisted in SQLite so finished results survive a restart.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from config import settings
+from agents.orchestrator import run_pipeline
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class JobStore:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                incremental INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                stage TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                result TEXT,
+                error TEXT
+            )
+        """)
+        self._db.commit()
+
+    def create(self, query: str, incremental: bool = False) -> dict:
+        now = time.time()
+        job = {"id": uuid.uuid4().hex, "query": query, "incremental": int(incremental), "status": "queued",
+               "stage": None, "created_at": now, "updated_at": now, "error": None}
+        self._db.execute(
+            "INSERT INTO jobs (id, query, incremental, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job["id"], query, int(incremental), "queued", now, now),
+        )
+        self._db.commit()
+        return job
+
+    def update(self, job_id: str, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], default=str)
+        fields["updated_at"] = time.time()
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        self._db.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+        self._db.commit()
+
+    def get(self, job_id: str, with_result: bool = False) -> dict | None:
+        row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        result = job.pop("result")
+        if with_result:
+            job["result"] = json.loads(result) if result else None
+        return job
+
+    def find_active(self, query: str, incremental: bool = False) -> dict | None:
+        row = self._db.execute(
+            "SELECT id FROM jobs WHERE query = ? AND incremental = ? AND status IN (?, ?) "
+            "ORDER BY created_at LIMIT 1",
+            (query, int(incremental), *ACTIVE_STATUSES),
+        ).fetchone()
+        return self.get(row["id"]) if row else None
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        rows = self._db.execute(
+            "SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self.get(r["id"]) for r in rows]
+
+    def ids_with_status(self, status: str) -> list[str]:
+        rows = self._db.execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (status,)
+        ).fetchall()
+        return [r["id"] for r in rows]
+
+
+class JobQueue:
+    def __init__(self):
+        self.store = JobStore(settings.JOB_STORE_PATH)
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._running: dict[str, asyncio.Task] = {}
+        self._cancel_requested: set[str] = set()
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=settings.JOB_QUEUE_DEPTH)
+        # Runs interrupted by the last shutdown cannot be resumed mid-way
+        for job_id in self.store.ids_with_status("running"):
+            self.store.update(job_id, status="error", error="interrupted by restart")
+        for job_id in self.store.ids_with_status("queued"):
+            try:
+                self._queue.put_nowait(job_id)
+            except asyncio.QueueFull:
+                self.store.update(job_id, status="error", error="dropped on restart: queue full")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(settings.JOB_WORKERS)]
+        logger.info("Job queue started (%d workers, depth %d)", settings.JOB_WORKERS, settings.JOB_QUEUE_DEPTH)
+
+    @property
+    def is_running(self) -> bool:
+        return self._queue is not None
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # ------------------------------------------------------------------ #
+    def submit(self, query: str, incremental: bool = False) -> dict:
+        """Queue a pipeline run, or return the already active job for the same query."""
+        existing = self.store.find_active(query, incremental)
+        if existing:
+            return existing
+        if self._queue.full():
+            raise QueueFullError(f"Job queue is full ({settings.JOB_QUEUE_DEPTH} pending)")
+        job = self.store.create(query, incremental)
+        self._queue.put_nowait(job["id"])
+        return job
+
+    def get(self, job_id: str, with_result: bool = False) -> dict | None:
+        return self.store.get(job_id, with_result)
+
+    def recent(self) -> list[dict]:
+        return self.store.recent()
+
+    def cancel(self, job_id: str) -> dict | None:
+        job = self.store.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATUSES:
+            return job
+        self.store.update(job_id, status="cancelled")
+        task = self._running.get(job_id)
+        if task:
+            self._cancel_requested.add(job_id)
+            task.cancel()
+        else:
+            self._close_subscribers(job_id)  # still queued; _run will never publish for it
+        return self.store.get(job_id)
+
+    # ------------------------------------------------------------------ #
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Queue receiving the job's (event, payload) pipeline events, then None when it ends."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    def _publish(self, job_id: str, item):
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(item)
+
+    def _close_subscribers(self, job_id: str):
+        self._publish(job_id, None)
+        self._subscribers.pop(job_id, None)
+
+    # ------------------------------------------------------------------ #
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self.store.get(job_id)
+                if job and job["status"] == "queued":
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: dict):
+        job_id = job["id"]
+        self.store.update(job_id, status="running")
+
+        async def on_event(event: str, payload: dict):
+            if event == "status":
+                self.store.update(job_id, stage=payload["status"])
+            self._publish(job_id, (event, payload))
+
+        task = asyncio.create_task(run_pipeline(job["query"], on_event=on_event, incremental=bool(job["incremental"])))
+        self._running[job_id] = task
+        try:
+            state = await task
+            status = "error" if state.get("error") else "complete"
+            self.store.update(job_id, status=status, result=state, error=state.get("error"))
+            self._publish(job_id, ("result", state))
+        except asyncio.CancelledError:
+            if job_id not in self._cancel_requested:
+                raise  # the worker itself is shutting down; start() marks the job on next boot
+        except Exception as exc:
+            logger.error("Job %s failed: %s", job_id, exc)
+            self.store.update(job_id, status="error", error=str(exc))
+        finally:
+            self._running.pop(job_id, None)
+            self._cancel_requested.discard(job_id)
+            self._close_subscribers(job_id)
+
+
+job_queue = JobQueue()
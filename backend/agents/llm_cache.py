@@ -0,0 +1,128 @@
+"""
+LLM cache — persistent cache of LLM responses keyed by provider, model,
+prompt version and a hash of the normalised input text.
+Optionally matches near-duplicate inputs by SimHash distance.
+"""
+import hashlib
+import logging
+import os
+import re
+from config import settings
+from tools.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+_WS = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    return _WS.sub(" ", text).strip().lower()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def prompt_version(*templates: str) -> str:
+    """Short fingerprint of the prompt templates, so edits invalidate old entries."""
+    return hashlib.sha256("\x1f".join(templates).encode("utf-8")).hexdigest()[:12]
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word trigrams."""
+    words = _WORD.findall(normalize_text(text))
+    shingles = [" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))]
+    weights = [0] * 64
+    for sh in shingles:
+        h = int.from_bytes(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+class LLMCache:
+    def __init__(self, name: str, similarity: int | None = None):
+        self.store = DiskCache(name, os.path.join(settings.CACHE_DIR, name), settings.LLM_CACHE_MAX_BYTES)
+        self.similarity = settings.LLM_CACHE_SIMILARITY if similarity is None else similarity
+        self.tokens_saved = 0
+        self.near_hits = 0
+        self._fingerprints: dict[str, dict[str, int]] = {}  # scope key -> {entry key: simhash}
+        self._scopes: dict[str, str] = {}  # entry key -> scope key
+        if self.similarity > 0:
+            self.store.on_remove = self._forget
+            self._load_fingerprints()
+
+    def _load_fingerprints(self):
+        """Rebuild the near-duplicate index from the simhashes stored with each entry."""
+        for key, meta in self.store.meta():
+            if "simhash" in meta and "scope" in meta:
+                self._index_fingerprint(meta["scope"], key, meta["simhash"])
+
+    def _index_fingerprint(self, scope_key: str, key: str, fp: int):
+        self._fingerprints.setdefault(scope_key, {})[key] = fp
+        self._scopes[key] = scope_key
+
+    def _forget(self, key: str):
+        scope_key = self._scopes.pop(key, None)
+        if scope_key is not None:
+            fingerprints = self._fingerprints[scope_key]
+            fingerprints.pop(key, None)
+            if not fingerprints:
+                del self._fingerprints[scope_key]
+
+    def lookup(self, scope: tuple, text: str):
+        """Return a cached payload for *text* within *scope*, or None."""
+        key, entry = self._find(scope, text)
+        if entry is None:
+            self.store.miss()
+            return None
+        self.store.hit()
+        if key != self.store.key(*scope, text_hash(text)):
+            self.near_hits += 1
+        self.tokens_saved += entry["meta"].get("tokens", 0)
+        return entry["payload"]
+
+    def discard(self, scope: tuple, text: str) -> bool:
+        """Remove the entry lookup() would return for *text*. True if there was one."""
+        key, entry = self._find(scope, text)
+        if entry is None:
+            return False
+        self.store.delete(key)
+        return True
+
+    def _find(self, scope: tuple, text: str) -> tuple[str | None, dict | None]:
+        key = self.store.key(*scope, text_hash(text))
+        entry = self.store.get(key)
+        if entry is None and self.similarity > 0:
+            return self._near_duplicate(scope, text)
+        return key, entry
+
+    def _near_duplicate(self, scope: tuple, text: str) -> tuple[str | None, dict | None]:
+        fp = simhash(text)
+        for key, other in list(self._fingerprints.get(self.store.key(*scope), {}).items()):
+            if bin(fp ^ other).count("1") <= self.similarity:
+                entry = self.store.get(key)
+                if entry is not None:
+                    return key, entry
+        return None, None
+
+    def store_result(self, scope: tuple, text: str, payload, tokens: int):
+        key = self.store.key(*scope, text_hash(text))
+        meta = {"tokens": tokens}
+        if self.similarity > 0:
+            meta.update(scope=self.store.key(*scope), simhash=simhash(text))
+        self.store.put(key, payload, meta)
+        if self.similarity > 0 and key in self.store:  # a single oversized entry is evicted at once
+            self._index_fingerprint(meta["scope"], key, meta["simhash"])
+
+    def stats(self) -> dict:
+        return {**self.store.stats(), "near_hits": self.near_hits, "tokens_saved": self.tokens_saved}
+
+
+extraction_cache = LLMCache("llm_extraction")
+cypher_cache = LLMCache("llm_cypher", similarity=settings.CYPHER_CACHE_SIMILARITY)
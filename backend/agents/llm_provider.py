@@ -0,0 +1,136 @@
+"""
+LLM provider — builds chat-model clients once and reuses them for every call.
+Clients are pooled per (provider, model); every call is routed through the
+LLM scheduler and recorded in per-model latency and token metrics.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from config import settings
+from agents.llm_scheduler import llm_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def _estimate_tokens(messages: list) -> int:
+    return max(sum(len(str(m.content)) for m in messages) // 4, 1)
+
+
+class LLMProvider:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._clients = {}
+            cls._instance._metrics = defaultdict(lambda: {
+                "calls": 0, "errors": 0, "latency_ms": 0.0, "input_tokens": 0, "output_tokens": 0,
+            })
+        return cls._instance
+
+    # ------------------------------------------------------------------ #
+    @property
+    def is_enabled(self) -> bool:
+        """False in demo mode or when no hosted provider has credentials."""
+        is_ollama = settings.LLM_PROVIDER == "ollama"
+        return not (settings.DEMO_MODE or (not is_ollama and not settings.OPENAI_API_KEY and not settings.GEMINI_API_KEY))
+
+    @property
+    def provider(self) -> str:
+        if settings.LLM_PROVIDER == "openai" and settings.OPENAI_API_KEY:
+            return "openai"
+        if settings.LLM_PROVIDER == "ollama":
+            return "ollama"
+        return "gemini"
+
+    @property
+    def model_name(self) -> str:
+        return self.default_model(self.provider)
+
+    @staticmethod
+    def default_model(provider: str) -> str:
+        return {
+            "openai": settings.OPENAI_MODEL,
+            "ollama": settings.OLLAMA_MODEL,
+            "gemini": settings.GEMINI_MODEL,
+        }[provider]
+
+    def start(self):
+        """Build the default client up front so the first request skips construction."""
+        if self.is_enabled:
+            self.client()
+            logger.info("LLM client ready (%s/%s)", self.provider, self.model_name)
+
+    def client(self, provider: str | None = None, model: str | None = None):
+        provider = provider or self.provider
+        model = model or self.default_model(provider)
+        key = (provider, model)
+        if key not in self._clients:
+            if provider == "openai":
+                from langchain_openai import ChatOpenAI
+                self._clients[key] = ChatOpenAI(model=model, temperature=0, api_key=settings.OPENAI_API_KEY)
+            elif provider == "ollama":
+                from langchain_ollama import ChatOllama
+                self._clients[key] = ChatOllama(base_url=settings.OLLAMA_BASE_URL, model=model, temperature=0)
+            else:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+                self._clients[key] = ChatGoogleGenerativeAI(model=model, temperature=0, google_api_key=settings.GEMINI_API_KEY)
+        return self._clients[key]
+
+    @staticmethod
+    def messages(system: str, user: str) -> list:
+        from langchain_core.messages import SystemMessage, HumanMessage
+        return [SystemMessage(content=system), HumanMessage(content=user)]
+
+    # ------------------------------------------------------------------ #
+    def _record(self, model: str, started: float, response=None, failed: bool = False):
+        m = self._metrics[model]
+        m["calls"] += 1
+        m["errors"] += int(failed)
+        m["latency_ms"] += (time.perf_counter() - started) * 1000
+        usage = getattr(response, "usage_metadata", None) or {}
+        m["input_tokens"] += usage.get("input_tokens", 0)
+        m["output_tokens"] += usage.get("output_tokens", 0)
+
+    async def ainvoke(self, messages: list, provider: str | None = None, model: str | None = None):
+        provider = provider or self.provider
+        model = model or self.default_model(provider)
+        llm = self.client(provider, model)
+        started = time.perf_counter()
+        try:
+            response = await llm_scheduler.run(_estimate_tokens(messages), lambda: llm.ainvoke(messages))
+        except Exception:
+            self._record(model, started, failed=True)
+            raise
+        self._record(model, started, response)
+        return response
+
+    async def abatch(self, batch: list[list], provider: str | None = None, model: str | None = None) -> list:
+        return await asyncio.gather(*(self.ainvoke(m, provider, model) for m in batch))
+
+    async def astream(self, messages: list, provider: str | None = None, model: str | None = None):
+        provider = provider or self.provider
+        model = model or self.default_model(provider)
+        llm = self.client(provider, model)
+        started = time.perf_counter()
+        last = None
+        try:
+            # The slot is held until the stream ends, so streams count against the same limits
+            async with llm_scheduler.slot(_estimate_tokens(messages)):
+                async for chunk in llm.astream(messages):
+                    last = chunk
+                    yield chunk
+        except Exception:
+            self._record(model, started, failed=True)
+            raise
+        self._record(model, started, last)
+
+    def metrics(self) -> dict:
+        return {
+            model: {**m, "avg_latency_ms": round(m["latency_ms"] / m["calls"], 1) if m["calls"] else 0.0}
+            for model, m in self._metrics.items()
+        }
+
+
+llm_provider = LLMProvider()
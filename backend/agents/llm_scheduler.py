@@ -0,0 +1,128 @@
+"""
+LLM scheduler — bounds concurrent LLM calls by an in-flight limit plus
+requests-per-minute and tokens-per-minute budgets, and backs off on 429s.
+The in-flight limit adapts: it halves on a rate-limit error and creeps back
+up by one after a run of successful calls.
+"""
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def is_rate_limit_error(exc: Exception) -> bool:
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if status == 429:
+        return True
+    msg = str(exc).lower()
+    return "429" in msg or "rate limit" in msg or "resource_exhausted" in msg
+
+
+class _MinuteBudget:
+    """Continuous-refill token bucket with a per-minute capacity (0 = unlimited)."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.available = float(per_minute)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def take(self, amount: int):
+        if self.capacity <= 0:
+            return
+        amount = min(amount, self.capacity)
+        rate = self.capacity / 60.0
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.available = min(self.capacity, self.available + (now - self.updated) * rate)
+                self.updated = now
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                await asyncio.sleep((amount - self.available) / rate)
+
+
+class LLMScheduler:
+    def __init__(self, max_in_flight: int, rpm: int = 0, tpm: int = 0, retries: int = 4):
+        self.max_in_flight = max(max_in_flight, 1)
+        self.limit = self.max_in_flight
+        self.in_flight = 0
+        self.retries = retries
+        self.requests = _MinuteBudget(rpm)
+        self.tokens = _MinuteBudget(tpm)
+        self._cond = asyncio.Condition()
+        self._successes = 0
+
+    async def _acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def _release(self):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    async def _adjust(self, rate_limited: bool):
+        async with self._cond:
+            if rate_limited:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+                logger.warning("LLM rate limited — in-flight limit now %d", self.limit)
+            else:
+                self._successes += 1
+                if self.limit < self.max_in_flight and self._successes >= self.limit:
+                    self.limit += 1
+                    self._successes = 0
+                    self._cond.notify_all()
+
+    async def run(self, est_tokens: int, call: Callable[[], Awaitable]):
+        """Run *call* once budget and an in-flight slot are available, retrying on 429s."""
+        for attempt in range(self.retries + 1):
+            await self.requests.take(1)
+            await self.tokens.take(est_tokens)
+            await self._acquire()
+            try:
+                result = await call()
+            except Exception as exc:
+                if not is_rate_limit_error(exc) or attempt == self.retries:
+                    raise
+                await self._adjust(rate_limited=True)
+            else:
+                await self._adjust(rate_limited=False)
+                return result
+            finally:
+                await self._release()
+            await asyncio.sleep(settings.LLM_BACKOFF_BASE * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    @asynccontextmanager
+    async def slot(self, est_tokens: int):
+        """Hold budget and an in-flight slot for the duration of a streamed call (no retries)."""
+        await self.requests.take(1)
+        await self.tokens.take(est_tokens)
+        await self._acquire()
+        try:
+            yield
+        except Exception as exc:
+            if is_rate_limit_error(exc):
+                await self._adjust(rate_limited=True)
+            raise
+        else:
+            await self._adjust(rate_limited=False)
+        finally:
+            await self._release()
+
+
+def _max_in_flight() -> int:
+    if settings.LLM_PROVIDER == "ollama":
+        return settings.OLLAMA_MAX_CONCURRENCY
+    return settings.LLM_MAX_IN_FLIGHT
+
+
+llm_scheduler = LLMScheduler(_max_in_flight(), rpm=settings.LLM_RPM, tpm=settings.LLM_TPM)
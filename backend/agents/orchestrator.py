@@ -2,14 +2,21 @@
 Orchestrator — LangGraph multi-step pipeline for competitive intelligence.
 Flow: generate_cohort → crawl_all → extract_entities → build_graph → run_reasoning → generate_summary
 """
+import asyncio
 import logging
-from typing import TypedDict, Any
+from typing import TypedDict, Any, Awaitable, Callable
 from config import settings
 from agents.crawler_agent import crawl_cohort
-from agents.extractor_agent import extract_entities, entities_to_triples
+from agents.extractor_agent import (
+    extract_entities_live, entities_to_triples, EXTRACTION_PROMPT_VERSION, EXTRACTED_RELATIONSHIPS,
+)
+from agents.extraction_store import extraction_store, extraction_fingerprint
+from agents.llm_provider import llm_provider
 from agents.reasoning_agent import run_reasoning
-from graph.graph_queries import insert_triples, get_subgraph
+from graph.graph_queries import insert_triples, get_subgraph_page, sync_company_triples
 from graph.graph_schema import get_demo_graph_data
+from tools.pdf_report import schedule_prerender
+from graph.analytics import graph_analytics
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +27,10 @@ class PipelineState(TypedDict, total=False):
     crawled_data: list[dict]
     extractions: list[dict]
     triples: list[tuple]
+    ingest_stats: list[dict]
+    incremental: bool
+    changed_companies: list[str]
+    triple_delta: dict
     graph_data: dict
     reasoning: dict
     summary: dict
@@ -82,56 +93,114 @@ DEMO_COMPARISON = [
 ]
 
 
-async def run_pipeline(query: str) -> PipelineState:
-    """Run the full intelligence pipeline."""
+EventCallback = Callable[[str, dict], Awaitable]
+
+
+async def run_pipeline(query: str, on_event: EventCallback | None = None,
+                       incremental: bool = False) -> PipelineState:
+    """Run the full intelligence pipeline.
+
+    If *on_event* is given it is awaited with (event, payload) for every stage
+    change and for each company's crawl and extraction result as it completes.
+
+    With *incremental*, companies whose crawled text fingerprint matches the
+    stored one reuse their stored extraction and get no graph writes; changed
+    companies have only their triple delta applied.
+    """
+    async def emit(event: str, payload: dict):
+        if on_event:
+            await on_event(event, payload)
+
+    async def set_status(status: str):
+        state["status"] = status
+        await emit("status", {"status": status})
+
+    async def on_crawled(data: dict):
+        await emit("crawl", {k: v for k, v in data.items() if k != "raw_text"})
+
+    async def extract(data: dict) -> tuple[str, dict, bool, str | None]:
+        """Return (company, extraction, changed, fingerprint to store or None)."""
+        company = data["company"]
+        fingerprint = extraction_fingerprint(
+            data["raw_text"], llm_provider.provider, llm_provider.model_name, EXTRACTION_PROMPT_VERSION,
+        )
+        stored = extraction_store.get(company)
+        if incremental and stored and stored["fingerprint"] == fingerprint:
+            extraction, changed, to_store = stored["extraction"], False, None
+        else:
+            extraction, live = await extract_entities_live(company, data["raw_text"])
+            # The cohort name keys the store and the graph delta, whatever the LLM called the company
+            extraction, changed = {**extraction, "company": company}, True
+            # Demo fallbacks are never stored, so later incremental runs re-extract them
+            to_store = fingerprint if live else None
+        await emit("extraction", {"company": company, "extraction": extraction, "changed": changed})
+        return company, extraction, changed, to_store
+
     state: PipelineState = {
         "query": query,
         "cohort": settings.DEFAULT_COHORT,
         "status": "starting",
+        "incremental": incremental,
         "error": None,
     }
 
     try:
         # Step 1: Crawl
-        state["status"] = "crawling"
-        state["crawled_data"] = await crawl_cohort(state["cohort"])
+        await set_status("crawling")
+        state["crawled_data"] = await crawl_cohort(state["cohort"], on_result=on_crawled)
 
         # Step 2: Extract
-        state["status"] = "extracting"
-        extractions = []
-        all_triples = []
-        for data in state["crawled_data"]:
-            extraction = await extract_entities(data["company"], data["raw_text"])
-            extractions.append(extraction)
+        await set_status("extracting")
+        # Companies run concurrently; llm_scheduler enforces in-flight and rate budgets
+        results = await asyncio.gather(*(extract(data) for data in state["crawled_data"]))
+        all_triples, company_triples = [], {}
+        for company, extraction, _, _ in results:
             triples = entities_to_triples(extraction)
+            company_triples[company] = triples
             all_triples.extend(triples)
-        state["extractions"] = extractions
+        state["extractions"] = [extraction for _, extraction, _, _ in results]
         state["triples"] = all_triples
+        state["changed_companies"] = [company for company, _, changed, _ in results if changed]
 
         # Step 3: Insert into graph
-        state["status"] = "building_graph"
-        insert_triples(all_triples)
-        state["graph_data"] = get_subgraph()
+        await set_status("building_graph")
+        if incremental:
+            state["triple_delta"] = {
+                company: await sync_company_triples(company, company_triples[company], EXTRACTED_RELATIONSHIPS)
+                for company in state["changed_companies"]
+            }
+        else:
+            state["ingest_stats"] = await insert_triples(all_triples)
+        for company, extraction, _, fingerprint in results:
+            if fingerprint:
+                extraction_store.put(company, fingerprint, extraction, company_triples[company])
+        graph_analytics.schedule_refresh()
+        # First page only — clients fetch the rest from /graph with next_cursor
+        state["graph_data"] = await get_subgraph_page(page_size=settings.GRAPH_PAGE_SIZE)
 
         # If graph is empty (demo mode), use demo data
         if not state["graph_data"].get("nodes"):
             state["graph_data"] = get_demo_graph_data()
 
         # Step 4: Reasoning
-        state["status"] = "reasoning"
+        await set_status("reasoning")
         state["reasoning"] = await run_reasoning(query)
+        await emit("reasoning", state["reasoning"])
 
         # Step 5: Summary & Comparison
-        state["status"] = "generating_summary"
+        await set_status("generating_summary")
         state["summary"] = DEMO_SUMMARY
         state["comparison"] = DEMO_COMPARISON
 
-        state["status"] = "complete"
+        if settings.PRERENDER_REPORTS:
+            schedule_prerender(state["summary"], state["comparison"])
+
+        await set_status("complete")
 
     except Exception as exc:
         logger.error("Pipeline failed: %s", exc)
         state["error"] = str(exc)
-        state["status"] = "error"
+        await set_status("error")
         # Ensure demo data is available even on error
         state["graph_data"] = state.get("graph_data") or get_demo_graph_data()
         state["summary"] = state.get("summary") or DEMO_SUMMARY
@@ -3,13 +3,25 @@ Reasoning Agent — graph-based threat analysis and strategic inference.
 """
 import json
 import logging
-from config import settings
+import re
+from agents.llm_provider import llm_provider
+from agents.llm_cache import cypher_cache, prompt_version, estimate_tokens
+from graph.graph_schema import SCHEMA_STATEMENTS
 from prompts.graph_reasoning_prompt import REASONING_SYSTEM_PROMPT, REASONING_USER_PROMPT
 from prompts.graph_reasoning_prompt import NL_TO_CYPHER_SYSTEM, NL_TO_CYPHER_USER
-from graph.graph_queries import get_subgraph
+from agents.context_builder import build_context
 
 logger = logging.getLogger(__name__)
 
+# Cached translations are dropped whenever the schema or the prompt changes
+CYPHER_PROMPT_VERSION = prompt_version(*SCHEMA_STATEMENTS, NL_TO_CYPHER_SYSTEM, NL_TO_CYPHER_USER)
+DEMO_CYPHER = "MATCH (a:Company)-[r]->(b) WHERE a.name = 'Infosys' RETURN a, r, b LIMIT 25"
+FALLBACK_CYPHER = "MATCH (n) RETURN n LIMIT 25"
+
+_ENTITY_TERM = re.compile(r"\b(?:[A-Z][\w.&-]*|\w*\d\w*)")
+_QUESTION_WORDS = {"what", "which", "who", "whom", "how", "where", "when", "why", "is", "are", "does", "do",
+                   "show", "list", "find", "give", "get", "return", "count", "i", "the", "a", "an"}
+
 # ------------------------------------------------------------------ Demo
 DEMO_REASONING = {
     "threat_level": "high",
@@ -41,76 +53,65 @@ DEMO_REASONING = {
 
 async def run_reasoning(question: str, company: str | None = None) -> dict:
     """Perform graph-based reasoning to answer a strategic question."""
-    # Get graph context
-    graph_data = get_subgraph(company)
-    graph_context = _graph_to_text(graph_data)
-
-    is_ollama = settings.LLM_PROVIDER == "ollama"
-    if settings.DEMO_MODE or (not is_ollama and not settings.OPENAI_API_KEY and not settings.GEMINI_API_KEY):
+    if not llm_provider.is_enabled:
         logger.info("Using demo reasoning for: %s", question)
         return {**DEMO_REASONING, "question": question}
 
     try:
-        if settings.LLM_PROVIDER == "openai" and settings.OPENAI_API_KEY:
-            from langchain_openai import ChatOpenAI
-            llm = ChatOpenAI(model="gpt-4o", temperature=0, api_key=settings.OPENAI_API_KEY)
-        elif settings.LLM_PROVIDER == "ollama":
-            from langchain_ollama import ChatOllama
-            llm = ChatOllama(base_url=settings.OLLAMA_BASE_URL, model=settings.OLLAMA_MODEL, temperature=0)
-        else:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0, google_api_key=settings.GEMINI_API_KEY)
-
-        from langchain_core.messages import SystemMessage, HumanMessage
-        messages = [
-            SystemMessage(content=REASONING_SYSTEM_PROMPT),
-            HumanMessage(content=REASONING_USER_PROMPT.format(
-                graph_context=graph_context, question=question
-            )),
-        ]
-        response = await llm.ainvoke(messages)
+        graph_context = await build_context(question, company)
+        messages = llm_provider.messages(
+            REASONING_SYSTEM_PROMPT,
+            REASONING_USER_PROMPT.format(graph_context=graph_context, question=question),
+        )
+        response = await llm_provider.ainvoke(messages)
         return json.loads(response.content)
     except Exception as exc:
         logger.error("Reasoning failed: %s", exc)
         return {**DEMO_REASONING, "question": question, "error": str(exc)}
 
 
-async def nl_to_cypher(question: str) -> str:
-    """Convert natural-language question to Cypher (demo returns a sample)."""
-    is_ollama = settings.LLM_PROVIDER == "ollama"
-    if settings.DEMO_MODE or (not is_ollama and not settings.OPENAI_API_KEY and not settings.GEMINI_API_KEY):
-        return "MATCH (a:Company)-[r]->(b) WHERE a.name = 'Infosys' RETURN a, r, b LIMIT 25"
+def _cypher_scope(question: str) -> tuple:
+    # Names and numbers are part of the scope, so a near-duplicate match can only
+    # come from a paraphrase about the same entities ("Infosys" never hits "TCS").
+    terms = sorted({t.lower() for t in _ENTITY_TERM.findall(question)} - _QUESTION_WORDS)
+    return (llm_provider.provider, llm_provider.model_name, CYPHER_PROMPT_VERSION, *terms)
+
+
+async def translate_question(question: str) -> tuple[str, bool]:
+    """Convert a question to Cypher, using the translation cache. Returns (cypher, from_llm).
+
+    Fresh translations are only cached once the caller has executed them (see remember_cypher).
+    """
+    if not llm_provider.is_enabled:
+        return DEMO_CYPHER, False
+
+    cached = cypher_cache.lookup(_cypher_scope(question), question)
+    if cached is not None:
+        return cached["cypher"], False
 
     try:
-        if settings.LLM_PROVIDER == "openai" and settings.OPENAI_API_KEY:
-            from langchain_openai import ChatOpenAI
-            llm = ChatOpenAI(model="gpt-4o", temperature=0, api_key=settings.OPENAI_API_KEY)
-        elif settings.LLM_PROVIDER == "ollama":
-            from langchain_ollama import ChatOllama
-            llm = ChatOllama(base_url=settings.OLLAMA_BASE_URL, model=settings.OLLAMA_MODEL, temperature=0)
-        else:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0, google_api_key=settings.GEMINI_API_KEY)
-
-        from langchain_core.messages import SystemMessage, HumanMessage
-        messages = [
-            SystemMessage(content=NL_TO_CYPHER_SYSTEM),
-            HumanMessage(content=NL_TO_CYPHER_USER.format(question=question)),
-        ]
-        response = await llm.ainvoke(messages)
-        return response.content.strip()
+        messages = llm_provider.messages(NL_TO_CYPHER_SYSTEM, NL_TO_CYPHER_USER.format(question=question))
+        response = await llm_provider.ainvoke(messages)
+        return response.content.strip(), True
     except Exception as exc:
         logger.error("NL-to-Cypher failed: %s", exc)
-        return "MATCH (n) RETURN n LIMIT 25"
-
-
-def _graph_to_text(graph_data: dict) -> str:
-    """Convert graph data to readable text for LLM context."""
-    lines = ["Knowledge Graph Context:", ""]
-    lines.append("Nodes:")
-    for node in graph_data.get("nodes", []):
-        lines.append(f"  ({node['name']}) [{node['label']}]")
-    lines.append("\nRelationships:")
-    for edge in graph_data.get("edges", []):
-        lines.append(f"  ({edge['source']}) -[{edge['relationship']}]-> ({edge['target']})")
-    return "\n".join(lines)
+        return FALLBACK_CYPHER, False
+
+
+def remember_cypher(question: str, cypher: str):
+    """Cache a translation that passed the guard and executed successfully against Neo4j."""
+    cypher_cache.store_result(_cypher_scope(question), question, {"cypher": cypher}, estimate_tokens(question + cypher))
+
+
+def forget_cypher(question: str) -> bool:
+    """Evict the cached translation for *question*, e.g. after it failed. True if one was removed."""
+    if not llm_provider.is_enabled:
+        return False
+    return cypher_cache.discard(_cypher_scope(question), question)
+
+
+async def nl_to_cypher(question: str) -> str:
+    """Convert natural-language question to Cypher (demo returns a sample)."""
+    cypher, _ = await translate_question(question)
+    return cypher
+
@@ -14,11 +14,35 @@ class Settings:
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3")
+    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o")
+    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+    LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+    OLLAMA_MAX_CONCURRENCY: int = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))
+    LLM_RPM: int = int(os.getenv("LLM_RPM", "0"))  # 0 = unlimited
+    LLM_TPM: int = int(os.getenv("LLM_TPM", "0"))  # 0 = unlimited
+    LLM_BACKOFF_BASE: float = float(os.getenv("LLM_BACKOFF_BASE", "1"))
+    REASONING_CONTEXT_TOKENS: int = int(os.getenv("REASONING_CONTEXT_TOKENS", "1500"))
+    REASONING_CONTEXT_HOPS: int = int(os.getenv("REASONING_CONTEXT_HOPS", "2"))
 
     # Neo4j
     NEO4J_URI: str = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     NEO4J_USER: str = os.getenv("NEO4J_USER", "neo4j")
     NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "password123")
+    NEO4J_MAX_POOL_SIZE: int = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+    NEO4J_ACQUISITION_TIMEOUT: float = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30"))
+    NEO4J_QUERY_TIMEOUT: float = float(os.getenv("NEO4J_QUERY_TIMEOUT", "30"))
+    GRAPH_BATCH_SIZE: int = int(os.getenv("GRAPH_BATCH_SIZE", "1000"))
+    GRAPH_PAGE_SIZE: int = int(os.getenv("GRAPH_PAGE_SIZE", "200"))
+    GRAPH_MAX_PAGE_SIZE: int = int(os.getenv("GRAPH_MAX_PAGE_SIZE", "5000"))
+    GRAPH_READ_CACHE_SIZE: int = int(os.getenv("GRAPH_READ_CACHE_SIZE", "512"))
+    GRAPH_READ_CACHE_TTL: float = float(os.getenv("GRAPH_READ_CACHE_TTL", "60"))  # 0 = no expiry
+    # Guard for LLM-generated Cypher
+    CYPHER_MAX_ROWS: int = int(os.getenv("CYPHER_MAX_ROWS", "1000"))
+    CYPHER_TIMEOUT: float = float(os.getenv("CYPHER_TIMEOUT", "10"))
+    CYPHER_MAX_HOPS: int = int(os.getenv("CYPHER_MAX_HOPS", "4"))
+    CYPHER_MAX_ESTIMATED_ROWS: float = float(os.getenv("CYPHER_MAX_ESTIMATED_ROWS", "1000000"))
+    # Binary graph snapshot restored at startup when the graph is empty ("" = seed instead)
+    GRAPH_SNAPSHOT_PATH: str = os.getenv("GRAPH_SNAPSHOT_PATH", "")
 
     # App
     # Force DEMO_MODE off if using Ollama, otherwise default to False
@@ -26,6 +50,47 @@ class Settings:
     DEMO_MODE: bool = os.getenv("DEMO_MODE", _demo_default).lower() == "true"
     BACKEND_PORT: int = int(os.getenv("BACKEND_PORT", "8000"))
 
+    # HTTP
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "20"))
+    HTTP_RETRIES: int = int(os.getenv("HTTP_RETRIES", "3"))
+    HTTP_BACKOFF_BASE: float = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+    HTTP_HOST_RATE: float = float(os.getenv("HTTP_HOST_RATE", "2"))
+    HTTP2: bool = os.getenv("HTTP2", "true").lower() == "true"
+
+    # Crawling
+    CRAWL_CONCURRENCY: int = int(os.getenv("CRAWL_CONCURRENCY", "10"))
+    CRAWL_PER_HOST_LIMIT: int = int(os.getenv("CRAWL_PER_HOST_LIMIT", "2"))
+    CRAWL_SEARCH_HOST_LIMIT: int = int(os.getenv("CRAWL_SEARCH_HOST_LIMIT", "8"))
+    CRAWL_COMPANY_TIMEOUT: float = float(os.getenv("CRAWL_COMPANY_TIMEOUT", "45"))
+    CRAWL_SOURCE_TIMEOUT: float = float(os.getenv("CRAWL_SOURCE_TIMEOUT", "30"))
+
+    # Caches
+    CACHE_DIR: str = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(__file__), ".cache"))
+    CRAWL_CACHE_MAX_BYTES: int = int(os.getenv("CRAWL_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+    CRAWL_NEWS_TTL: float = float(os.getenv("CRAWL_NEWS_TTL", str(6 * 3600)))
+    CRAWL_IR_TTL: float = float(os.getenv("CRAWL_IR_TTL", str(7 * 24 * 3600)))
+
+    LLM_CACHE_MAX_BYTES: int = int(os.getenv("LLM_CACHE_MAX_BYTES", str(20 * 1024 * 1024)))
+    # Max SimHash bit distance for near-duplicate hits; 0 = exact matches only
+    LLM_CACHE_SIMILARITY: int = int(os.getenv("LLM_CACHE_SIMILARITY", "0"))
+    # Same, for the question -> Cypher translation cache (paraphrases of analyst questions)
+    CYPHER_CACHE_SIMILARITY: int = int(os.getenv("CYPHER_CACHE_SIMILARITY", "8"))
+
+    # Reports and exports
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", "1"))
+    REPORT_CACHE_MAX_FILES: int = int(os.getenv("REPORT_CACHE_MAX_FILES", "50"))
+    PRERENDER_REPORTS: bool = os.getenv("PRERENDER_REPORTS", "false").lower() == "true"
+    EXPORT_BATCH_ROWS: int = int(os.getenv("EXPORT_BATCH_ROWS", "50000"))
+
+    # Background jobs
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_DEPTH: int = int(os.getenv("JOB_QUEUE_DEPTH", "20"))
+    JOB_STORE_PATH: str = os.getenv("JOB_STORE_PATH", os.path.join(CACHE_DIR, "jobs.sqlite3"))
+    EXTRACTION_STORE_PATH: str = os.getenv("EXTRACTION_STORE_PATH", os.path.join(CACHE_DIR, "extractions.sqlite3"))
+
     # Cohort
     DEFAULT_COHORT: list[str] = [
         "Infosys", "TCS", "Wipro", "HCLTech", "Accenture"
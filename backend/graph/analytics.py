@@ -0,0 +1,189 @@
+"""
+Graph analytics — cohort-wide views precomputed with NumPy / SciPy sparse matrices.
+After each graph build the company × partner and company × region incidence
+matrices, pairwise Jaccard overlap, shared-region counts and degree / PageRank
+centrality are computed once and kept as serialised JSON, so reads are O(1).
+"""
+import asyncio
+import importlib.util
+import logging
+import time
+from graph.graph_stream import iter_nodes, iter_edges, dumps
+from graph.read_cache import graph_version
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_VIEWS = ("partner-overlap", "regions", "centrality")
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-9
+PAGERANK_MAX_ITER = 100
+
+
+def is_available() -> bool:
+    """NumPy and SciPy are optional; analytics are disabled without them."""
+    return all(importlib.util.find_spec(m) is not None for m in ("numpy", "scipy"))
+
+
+def _numpy():
+    # Imported on first refresh rather than at boot
+    import numpy as np
+    import scipy.sparse as sp
+    return np, sp
+
+
+# ------------------------------------------------------------------ compute
+def _incidence(np, sp, src, tgt, rel_mask, company_pos, n_companies, labels, target_label):
+    """Company × target 0/1 matrix for edges selected by *rel_mask*. Returns (matrix, target node ids)."""
+    mask = rel_mask & (company_pos[src] >= 0) & (labels[tgt] == target_label)
+    rows, cols = company_pos[src[mask]], tgt[mask]
+    targets = np.unique(cols)
+    matrix = sp.csr_matrix(
+        (np.ones(len(rows)), (rows, np.searchsorted(targets, cols))),
+        shape=(n_companies, len(targets)),
+    )
+    return (matrix > 0).astype(np.float64), targets
+
+
+def _pagerank(np, sp, src, tgt, n):
+    adjacency = sp.csr_matrix((np.ones(len(src)), (src, tgt)), shape=(n, n))
+    out_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    inv = np.divide(1.0, out_degree, out=np.zeros(n), where=out_degree > 0)
+    transition = (sp.diags(inv) @ adjacency).T.tocsr()
+    dangling = out_degree == 0
+    rank = np.full(n, 1.0 / n)
+    for _ in range(PAGERANK_MAX_ITER):
+        new = PAGERANK_DAMPING * (transition @ rank + rank[dangling].sum() / n) + (1 - PAGERANK_DAMPING) / n
+        converged = np.abs(new - rank).sum() < PAGERANK_TOLERANCE * n
+        rank = new
+        if converged:
+            break
+    return rank
+
+
+def compute_views(node_labels: dict[str, str], edges: list[tuple[str, str, str]]) -> dict[str, dict]:
+    """Compute every analytics view from (name -> label) nodes and (src, rel, tgt) edges."""
+    np, sp = _numpy()
+    for s, _, t in edges:
+        node_labels.setdefault(s, "Unknown")
+        node_labels.setdefault(t, "Unknown")
+    names = np.array(list(node_labels), dtype=object)
+    index = {name: i for i, name in enumerate(names)}
+    labels = np.array([node_labels[n] for n in names], dtype=object)
+    n = len(names)
+    src = np.fromiter((index[s] for s, _, _ in edges), np.int64, len(edges))
+    tgt = np.fromiter((index[t] for _, _, t in edges), np.int64, len(edges))
+    rels = np.array([r for _, r, _ in edges], dtype=object)
+
+    companies = np.flatnonzero(labels == "Company")
+    company_pos = np.full(n, -1, np.int64)
+    company_pos[companies] = np.arange(len(companies))
+    company_names = names[companies].tolist()
+
+    # Partner overlap — same semantics as find_common_partners: Company -[PARTNERS_WITH]-> Partner
+    partners, partner_ids = _incidence(np, sp, src, tgt, rels == "PARTNERS_WITH", company_pos, len(companies),
+                                       labels, "Partner")
+    shared = (partners @ partners.T).toarray()
+    sizes = np.asarray(partners.sum(axis=1)).ravel()
+    union = sizes[:, None] + sizes[None, :] - shared
+    jaccard = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+    regions, region_ids = _incidence(np, sp, src, tgt, rels == "OPERATES_IN", company_pos, len(companies),
+                                     labels, "Region")
+    shared_regions = (regions @ regions.T).toarray()
+
+    degree = np.bincount(src, minlength=n) + np.bincount(tgt, minlength=n)
+    rank = _pagerank(np, sp, src, tgt, n) if n else np.zeros(0)
+    order = np.argsort(-rank, kind="stable")
+
+    def by_company(matrix, ids):
+        matrix = matrix.tocsr()
+        return {
+            company: names[ids[matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]]].tolist()
+            for i, company in enumerate(company_names)
+        }
+
+    return {
+        "partner-overlap": {
+            "companies": company_names,
+            "partners": names[partner_ids].tolist(),
+            "partners_by_company": by_company(partners, partner_ids),
+            "shared_partners": shared.astype(int).tolist(),
+            "jaccard": np.round(jaccard, 4).tolist(),
+        },
+        "regions": {
+            "companies": company_names,
+            "regions": names[region_ids].tolist(),
+            "regions_by_company": by_company(regions, region_ids),
+            "shared_regions": shared_regions.astype(int).tolist(),
+        },
+        "centrality": {
+            "nodes": [
+                {
+                    "name": names[i],
+                    "label": labels[i],
+                    "degree": int(degree[i]),
+                    "degree_centrality": round(float(degree[i]) / max(n - 1, 1), 4),
+                    "pagerank": round(float(rank[i]), 6),
+                }
+                for i in order
+            ],
+        },
+    }
+
+
+# ------------------------------------------------------------------ store
+class GraphAnalytics:
+    """Materialised analytics views, refreshed in the background after graph builds."""
+
+    def __init__(self):
+        self._views: dict[str, bytes] = {}
+        self._meta: dict = {}
+        self._task: asyncio.Task | None = None
+        self._again = False
+
+    async def refresh(self):
+        version = graph_version()
+        started = time.perf_counter()
+        node_labels = {n["name"]: n["label"] async for n in iter_nodes()}
+        edges = [(e["source"], e["relationship"], e["target"]) async for e in iter_edges()]
+        views = await asyncio.to_thread(compute_views, node_labels, edges)
+        meta = {"graph_version": version, "computed_at": time.time()}
+        self._views = {name: dumps({**meta, **view}) for name, view in views.items()}
+        self._meta = {**meta, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                      "nodes": len(node_labels), "edges": len(edges)}
+        logger.info("Graph analytics refreshed in %.0f ms (%d nodes, %d edges)",
+                    self._meta["elapsed_ms"], len(node_labels), len(edges))
+
+    async def _run(self):
+        while True:
+            self._again = False
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.error("Graph analytics refresh failed: %s", exc)
+            if not self._again:
+                break
+
+    def schedule_refresh(self):
+        """Recompute in the background; a request during a refresh queues one more pass."""
+        if not is_available():
+            return
+        if self._task is not None and not self._task.done():
+            self._again = True
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def get(self, view: str) -> bytes | None:
+        return self._views.get(view)
+
+    def status(self) -> dict:
+        return {
+            "available": is_available(),
+            "views": list(ANALYTICS_VIEWS),
+            "refreshing": self._task is not None and not self._task.done(),
+            "stale": bool(self._meta) and self._meta["graph_version"] != graph_version(),
+            **self._meta,
+        }
+
+
+graph_analytics = GraphAnalytics()
@@ -0,0 +1,98 @@
+"""
+Bulk ingest — batched UNWIND/MERGE writer for graph triples.
+Triples are grouped by (src_label, rel, tgt_label) so labels and relationship
+types can be baked into one statement, and names are sent as parameter lists.
+"""
+import logging
+import time
+from collections import defaultdict
+from graph.neo4j_client import neo4j_client
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _merge_statement(src_label: str, rel: str, tgt_label: str) -> str:
+    return (
+        "UNWIND $rows AS row "
+        f"MERGE (a:{src_label} {{name: row.src}}) "
+        f"MERGE (b:{tgt_label} {{name: row.tgt}}) "
+        f"MERGE (a)-[:{rel}]->(b)"
+    )
+
+
+def _delete_statement(src_label: str, rel: str, tgt_label: str) -> str:
+    return (
+        "UNWIND $rows AS row "
+        f"MATCH (a:{src_label} {{name: row.src}})-[r:{rel}]->(b:{tgt_label} {{name: row.tgt}}) "
+        "DELETE r"
+    )
+
+
+def _node_statement(label: str) -> str:
+    return f"UNWIND $rows AS row MERGE (:{label} {{name: row.name}})"
+
+
+def group_triples(triples: list[tuple]) -> dict[tuple, list[dict]]:
+    """Group (src_label, src_name, rel, tgt_label, tgt_name) tuples by shape, dropping duplicates."""
+    groups = defaultdict(list)
+    for src_label, src_name, rel, tgt_label, tgt_name in dict.fromkeys(triples):
+        groups[(src_label, rel, tgt_label)].append({"src": src_name, "tgt": tgt_name})
+    return groups
+
+
+async def ingest_triples(triples: list[tuple], batch_size: int | None = None) -> list[dict]:
+    """MERGE triples in chunked UNWIND batches. Returns per-batch stats."""
+    return await _run_batched(triples, _merge_statement, batch_size, "Ingested")
+
+
+async def delete_triples(triples: list[tuple], batch_size: int | None = None) -> list[dict]:
+    """Delete the relationships for the given triples (nodes are left in place)."""
+    return await _run_batched(triples, _delete_statement, batch_size, "Deleted")
+
+
+async def ingest_nodes(nodes: list[tuple[str, str]], batch_size: int | None = None) -> list[dict]:
+    """MERGE (label, name) nodes — e.g. nodes with no relationships — in chunked UNWIND batches."""
+    batch_size = batch_size or settings.GRAPH_BATCH_SIZE
+    stats = []
+    if not neo4j_client.is_connected or not nodes:
+        return stats
+    groups = defaultdict(list)
+    for label, name in dict.fromkeys(nodes):
+        groups[label].append({"name": name})
+    for label, rows in groups.items():
+        cypher = _node_statement(label)
+        for offset in range(0, len(rows), batch_size):
+            chunk = rows[offset:offset + batch_size]
+            await neo4j_client.run_write(cypher, {"rows": chunk})
+            stats.append({"label": label, "rows": len(chunk)})
+    logger.info("Ingested %d nodes in %d batches", sum(s["rows"] for s in stats), len(stats))
+    return stats
+
+
+async def _run_batched(triples: list[tuple], statement, batch_size: int | None, verb: str) -> list[dict]:
+    batch_size = batch_size or settings.GRAPH_BATCH_SIZE
+    stats = []
+    if not neo4j_client.is_connected or not triples:
+        return stats
+
+    started = time.perf_counter()
+    for (src_label, rel, tgt_label), rows in group_triples(triples).items():
+        cypher = statement(src_label, rel, tgt_label)
+        for offset in range(0, len(rows), batch_size):
+            chunk = rows[offset:offset + batch_size]
+            t0 = time.perf_counter()
+            await neo4j_client.run_write(cypher, {"rows": chunk})
+            stats.append({
+                "src_label": src_label,
+                "rel": rel,
+                "tgt_label": tgt_label,
+                "rows": len(chunk),
+                "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2),
+            })
+            logger.debug("%s %d %s-[%s]->%s rows in %.1f ms",
+                         verb, len(chunk), src_label, rel, tgt_label, stats[-1]["elapsed_ms"])
+
+    logger.info("%s %d triples in %d batches (%.1f ms)",
+                verb, sum(s["rows"] for s in stats), len(stats), (time.perf_counter() - started) * 1000)
+    return stats
@@ -0,0 +1,153 @@
+"""
+Cypher guard — checks and bounds LLM-generated Cypher before it reaches Neo4j.
+Queries must be single read-only statements with bounded variable-length paths.
+Each one is EXPLAINed first and rejected if the planner expects too many rows,
+then run in a read-access session with a LIMIT, a transaction timeout and a row cap.
+"""
+import logging
+import re
+from config import settings
+from graph.neo4j_client import neo4j_client
+
+logger = logging.getLogger(__name__)
+
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`")
+_COMMENTS = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+_STRINGS_OR_COMMENTS = re.compile(f"{_STRINGS.pattern}|{_COMMENTS.pattern}", re.S)
+_WRITE_CLAUSE = re.compile(r"\b(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV|IN\s+TRANSACTIONS)\b", re.I)
+_NOT_A_CLAUSE = re.compile(r"(?:\.|\bAS)\s*$", re.I)  # n.set, RETURN x AS set
+_CALL = re.compile(r"\bCALL\s+([\w.]+)", re.I)
+_REL_PATTERN = re.compile(r"-\[([^\]]*)\]")
+_VAR_LENGTH = re.compile(r"\*\s*(\d+)?\s*(\.\.)?\s*(\d+)?")
+_TRAILING_LIMIT = re.compile(r"\bLIMIT\s+(\d+|\$\w+)\s*$", re.I)
+_RETURN = re.compile(r"\bRETURN\b", re.I)
+_WRITE_OPERATOR = re.compile(r"^(Create|Merge|Delete|DetachDelete|Set|Remove|Foreach|LoadCSV|TransactionForeach)")
+
+READ_PROCEDURES = {"db.labels", "db.relationshiptypes", "db.propertykeys", "db.schema.visualization"}
+
+
+class CypherRejected(ValueError):
+    """Raised when generated Cypher fails a guard check."""
+
+    def __init__(self, reason: str, estimated_rows: float | None = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.estimated_rows = estimated_rows
+
+
+# ------------------------------------------------------------------ static checks
+def _strip_literals(cypher: str) -> str:
+    # One pass, so "//" inside a string is not taken for a comment
+    return _STRINGS_OR_COMMENTS.sub(lambda m: " " if m.group(0).startswith("/") else "''", cypher)
+
+
+def _strip_comments(cypher: str) -> str:
+    """Drop comments but keep string literals, including any "//" inside them."""
+    return _STRINGS_OR_COMMENTS.sub(lambda m: " " if m.group(0).startswith("/") else m.group(0), cypher).strip()
+
+
+def _write_clause(code: str) -> str | None:
+    for match in _WRITE_CLAUSE.finditer(code):
+        if not _NOT_A_CLAUSE.search(code, 0, match.start()):
+            return match.group(1).upper()
+    return None
+
+
+def check_cypher(cypher: str) -> str:
+    """Validate *cypher* and return it with a LIMIT of at most CYPHER_MAX_ROWS. Raises CypherRejected."""
+    # Comments are dropped up front so a trailing "// ..." cannot hide a LIMIT or swallow an appended one
+    cypher = _strip_comments(cypher).rstrip(";").strip()
+    if not cypher:
+        raise CypherRejected("empty query")
+    code = _strip_literals(cypher)
+    if ";" in code:
+        raise CypherRejected("multiple statements")
+    write = _write_clause(code)
+    if write:
+        raise CypherRejected(f"write clause {write}")
+    for proc in _CALL.findall(code):
+        if proc.lower() not in READ_PROCEDURES:
+            raise CypherRejected(f"procedure {proc} is not allowed")
+    for pattern in _REL_PATTERN.findall(code):
+        length = _VAR_LENGTH.search(pattern)
+        if not length:
+            continue
+        lower, dots, upper = length.groups()
+        hops = int(upper) if upper else (int(lower) if lower and not dots else None)
+        if hops is None or hops > settings.CYPHER_MAX_HOPS:
+            raise CypherRejected(f"unbounded or too deep variable-length path [{pattern}]")
+
+    if not _RETURN.search(code):
+        return cypher  # e.g. a bare CALL; the streaming row cap still applies
+    limit = _TRAILING_LIMIT.search(cypher)  # only code can end the query now, not a literal or comment
+    if limit is None:
+        return f"{cypher}\nLIMIT {settings.CYPHER_MAX_ROWS}"
+    if limit.group(1).startswith("$"):
+        raise CypherRejected("parameterised LIMIT is not allowed")
+    if int(limit.group(1)) > settings.CYPHER_MAX_ROWS:
+        return cypher[:limit.start()] + f"LIMIT {settings.CYPHER_MAX_ROWS}"
+    return cypher
+
+
+# ------------------------------------------------------------------ plan checks
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("children", []):
+        yield from _walk(child)
+
+
+def _estimated_rows(plan: dict | None) -> float | None:
+    if not plan:
+        return None
+    return max(op.get("args", op.get("arguments", {})).get("EstimatedRows", 0) for op in _walk(plan))
+
+
+def check_plan(plan: dict | None):
+    """Reject plans that write or that the planner expects to produce too many rows."""
+    if not plan:
+        return
+    estimated = _estimated_rows(plan)
+    for op in _walk(plan):
+        operator = op.get("operatorType", "")
+        if _WRITE_OPERATOR.match(operator):
+            raise CypherRejected(f"plan contains write operator {operator}", estimated)
+    if estimated and estimated > settings.CYPHER_MAX_ESTIMATED_ROWS:
+        raise CypherRejected(f"estimated {estimated:,.0f} rows exceeds {settings.CYPHER_MAX_ESTIMATED_ROWS:,.0f}",
+                             estimated)
+
+
+async def _log_rejection(cypher: str, exc: CypherRejected):
+    estimated = exc.estimated_rows
+    if estimated is None:
+        try:
+            estimated = _estimated_rows(await neo4j_client.explain(cypher, timeout=settings.CYPHER_TIMEOUT))
+        except Exception:
+            pass  # the estimate is best-effort; the query is rejected either way
+    logger.warning("Rejected generated Cypher (%s; estimated rows: %s): %s",
+                   exc.reason, "unknown" if estimated is None else f"{estimated:,.0f}", cypher)
+
+
+# ------------------------------------------------------------------ execution
+async def guarded_query(cypher: str, params: dict | None = None):
+    """Check, EXPLAIN and stream the rows of *cypher*, stopping at CYPHER_MAX_ROWS.
+
+    Cached translations are EXPLAINed too: the plan check is cheap and does not run the query.
+    """
+    try:
+        bounded = check_cypher(cypher)
+        check_plan(await neo4j_client.explain(bounded, params, timeout=settings.CYPHER_TIMEOUT))
+    except CypherRejected as exc:
+        await _log_rejection(cypher, exc)
+        raise
+
+    count = 0
+    rows = neo4j_client.stream_query(bounded, params, timeout=settings.CYPHER_TIMEOUT, read_only=True)
+    try:
+        async for row in rows:
+            yield row
+            count += 1
+            if count >= settings.CYPHER_MAX_ROWS:
+                logger.info("Generated Cypher truncated at %d rows", count)
+                break
+    finally:
+        await rows.aclose()  # release the session as soon as the cap is hit
@@ -1,42 +1,124 @@
 """
 Graph queries — Cypher builders and natural-language-to-Cypher via LLM.
 """
+import base64
+import bisect
+import json
+from collections import defaultdict
+from itertools import combinations_with_replacement
 from graph.neo4j_client import neo4j_client
-from graph.graph_schema import get_demo_graph_data, SEED_TRIPLES
+from graph.graph_schema import get_demo_graph_data
+from graph.memory_graph import memory_graph
+from graph.bulk_ingest import ingest_triples, delete_triples
+from graph.read_cache import cached_read
+from graph.cypher_guard import guarded_query
 from config import settings
 
 
 # ------------------------------------------------------------------ helpers
 def _demo_subgraph(company: str | None = None) -> dict:
-    data = get_demo_graph_data()
-    if company:
-        relevant_edges = [
-            e for e in data["edges"]
-            if company.lower() in e["source"].lower() or company.lower() in e["target"].lower()
-        ]
-        relevant_names = set()
-        for e in relevant_edges:
-            relevant_names.add(e["source"])
-            relevant_names.add(e["target"])
-        data["nodes"] = [n for n in data["nodes"] if n["name"] in relevant_names]
-        data["edges"] = relevant_edges
-    return data
+    if not company:
+        return memory_graph.to_graph_data()
+    matched = memory_graph.find_nodes(company)
+    matched_set = set(matched)
+    nodes, edges = {}, []
+    for node in matched:
+        nodes[node] = memory_graph.node(node)
+        for rel, tgt in memory_graph.out_edges(node):
+            nodes.setdefault(tgt, memory_graph.node(tgt))
+            edges.append({"source": memory_graph.name(node), "target": memory_graph.name(tgt), "relationship": rel})
+        for rel, src in memory_graph.in_edges(node):
+            if src in matched_set:
+                continue  # already emitted as an outgoing edge of src
+            nodes.setdefault(src, memory_graph.node(src))
+            edges.append({"source": memory_graph.name(src), "target": memory_graph.name(node), "relationship": rel})
+    if not edges:
+        return {"nodes": [], "edges": []}
+    return {"nodes": list(nodes.values()), "edges": edges}
+
+
+def encode_cursor(src: str, src_label: str, rel: str, tgt: str, tgt_label: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([src, src_label, rel, tgt, tgt_label]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, str, str, str, str]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        src, src_label, rel, tgt, tgt_label = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    return src, src_label, rel, tgt, tgt_label
+
+
+def _demo_subgraph_page(after, page_size, labels, rel_types, company) -> dict:
+    edges = memory_graph.sorted_edges()
+    label = memory_graph.label
+
+    def key(edge):
+        # Names are unique in the memory graph, so this orders exactly like sorted_edges
+        src, rel, tgt, s, t = edge
+        return src, label(s), rel, tgt, label(t)
+
+    start = bisect.bisect_right(edges, tuple(after), key=key) if after else 0
+    # Same name resolution as _demo_subgraph: case-insensitive, falling back to a substring match
+    matched = set(memory_graph.find_nodes(company)) if company else None
+    nodes, page, last = {}, [], None
+    for edge in edges[start:]:
+        src, rel, tgt, s, t = edge
+        if rel_types and rel not in rel_types:
+            continue
+        if labels and (label(s) not in labels or label(t) not in labels):
+            continue
+        if matched is not None and s not in matched and t not in matched:
+            continue
+        if len(page) == page_size:
+            return {"nodes": list(nodes.values()), "edges": page, "next_cursor": encode_cursor(*key(last))}
+        nodes.setdefault(s, memory_graph.node(s))
+        nodes.setdefault(t, memory_graph.node(t))
+        page.append({"source": src, "target": tgt, "relationship": rel})
+        last = edge
+    return {"nodes": list(nodes.values()), "edges": page, "next_cursor": None}
 
 
 # ------------------------------------------------------------------ public
-def insert_triples(triples: list[tuple]):
-    """Insert a list of (src_label, src_name, rel, tgt_label, tgt_name) tuples."""
-    for src_label, src_name, rel, tgt_label, tgt_name in triples:
-        cypher = (
-            f"MERGE (a:{src_label} {{name: $src}}) "
-            f"MERGE (b:{tgt_label} {{name: $tgt}}) "
-            f"MERGE (a)-[:{rel}]->(b)"
-        )
-        neo4j_client.run_write(cypher, {"src": src_name, "tgt": tgt_name})
+async def insert_triples(triples: list[tuple], batch_size: int | None = None) -> list[dict]:
+    """Insert a list of (src_label, src_name, rel, tgt_label, tgt_name) tuples in UNWIND batches."""
+    return await ingest_triples(triples, batch_size)
+
+
+async def get_company_triples(company: str, rels: list[str]) -> list[tuple]:
+    """Outgoing (Company, company, rel, label, name) triples currently stored for *company*."""
+    cypher = """
+        MATCH (c:Company {name: $company})-[r]->(b)
+        WHERE type(r) IN $rels
+        RETURN type(r) AS rel, labels(b)[0] AS tgt_label, b.name AS tgt
+    """
+    rows = await neo4j_client.run_query(cypher, {"company": company, "rels": rels})
+    return [("Company", company, r["rel"], r["tgt_label"], r["tgt"]) for r in rows]
+
 
+async def sync_company_triples(company: str, triples: list[tuple], rels: list[str]) -> dict:
+    """Make *company*'s outgoing *rels* edges match *triples*, writing only the difference.
 
-def get_subgraph(company: str | None = None) -> dict:
-    """Return sub-graph centred on *company*. Falls back to demo data."""
+    Offline nothing is written, so nothing is reported as added or removed.
+    """
+    if not neo4j_client.is_connected:
+        return {"added": 0, "removed": 0}
+    existing = set(await get_company_triples(company, rels))
+    wanted = set(triples)
+    added, removed = wanted - existing, existing - wanted
+    await delete_triples(list(removed))
+    await insert_triples(list(added))
+    return {"added": len(added), "removed": len(removed)}
+
+
+@cached_read
+async def get_subgraph(company: str | None = None) -> dict:
+    """Return sub-graph centred on *company*. Falls back to demo data.
+
+    Unbounded: without *company* this is the whole graph. It backs in-process indexes
+    (the reasoning context builder); responses should use get_subgraph_page or graph_stream.
+    """
     if not neo4j_client.is_connected:
         return _demo_subgraph(company)
 
@@ -56,9 +138,8 @@ def get_subgraph(company: str | None = None) -> dict:
             RETURN labels(a)[0] AS src_label, a.name AS src,
                    type(r) AS rel,
                    labels(b)[0] AS tgt_label, b.name AS tgt
-            LIMIT 200
         """
-    rows = neo4j_client.run_query(cypher, params)
+    rows = await neo4j_client.run_query(cypher, params)
     nodes, edges = {}, []
     for r in rows:
         nodes[r["src"]] = {"id": r["src"], "label": r["src_label"], "name": r["src"]}
@@ -67,35 +148,134 @@ def get_subgraph(company: str | None = None) -> dict:
     return {"nodes": list(nodes.values()), "edges": edges}
 
 
-def find_common_partners(company_a: str, company_b: str) -> list[str]:
+@cached_read
+async def get_subgraph_page(cursor: str | None = None, page_size: int = 200,
+                            labels: tuple[str, ...] = (), rel_types: tuple[str, ...] = (),
+                            company: str | None = None) -> dict:
+    """One keyset-paginated page of edges ordered by (source, source label, relationship, target, target label).
+
+    *labels* keeps edges whose endpoints both carry one of the labels; *rel_types*
+    keeps the listed relationship types. ``next_cursor`` is None on the last page.
+    """
+    after = decode_cursor(cursor) if cursor else None
     if not neo4j_client.is_connected:
-        partners_a = {t[4] for t in SEED_TRIPLES if t[1] == company_a and t[2] == "PARTNERS_WITH"}
-        partners_b = {t[4] for t in SEED_TRIPLES if t[1] == company_b and t[2] == "PARTNERS_WITH"}
-        return list(partners_a & partners_b)
+        return _demo_subgraph_page(after, page_size, labels, rel_types, company)
+
+    # Labels are part of the key: same-named nodes with different labels are distinct nodes
+    cypher = """
+        MATCH (a)-[r]->(b)
+        WHERE (size($labels) = 0 OR (labels(a)[0] IN $labels AND labels(b)[0] IN $labels))
+          AND (size($rels) = 0 OR type(r) IN $rels)
+          AND ($company IS NULL OR a.name = $company OR b.name = $company)
+        WITH a, r, b, coalesce(labels(a)[0], '') AS src_label, coalesce(labels(b)[0], '') AS tgt_label
+        WHERE $after IS NULL
+              OR a.name > $after[0]
+              OR (a.name = $after[0] AND (src_label > $after[1]
+                  OR (src_label = $after[1] AND (type(r) > $after[2]
+                      OR (type(r) = $after[2] AND (b.name > $after[3]
+                          OR (b.name = $after[3] AND tgt_label > $after[4])))))))
+        RETURN src_label, a.name AS src,
+               type(r) AS rel,
+               tgt_label, b.name AS tgt
+        ORDER BY src, src_label, rel, tgt, tgt_label
+        LIMIT $limit
+    """
+    rows = await neo4j_client.run_query(cypher, {
+        "labels": list(labels), "rels": list(rel_types), "company": company,
+        "after": list(after) if after else None, "limit": page_size + 1,
+    })
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    nodes, edges = {}, []
+    for r in rows:
+        nodes[r["src"]] = {"id": r["src"], "label": r["src_label"], "name": r["src"]}
+        nodes[r["tgt"]] = {"id": r["tgt"], "label": r["tgt_label"], "name": r["tgt"]}
+        edges.append({"source": r["src"], "target": r["tgt"], "relationship": r["rel"]})
+    last = rows[-1] if has_more else None
+    next_cursor = (encode_cursor(last["src"], last["src_label"], last["rel"], last["tgt"], last["tgt_label"])
+                   if last else None)
+    return {"nodes": list(nodes.values()), "edges": edges, "next_cursor": next_cursor}
+
+
+@cached_read
+async def find_common_partners(company_a: str, company_b: str) -> list[str]:
+    if not neo4j_client.is_connected:
+        partners_a = memory_graph.out_neighbours(memory_graph.node_id(company_a), "PARTNERS_WITH")
+        partners_b = set(memory_graph.out_neighbours(memory_graph.node_id(company_b), "PARTNERS_WITH"))
+        return [memory_graph.name(p) for p in partners_a if p in partners_b]
 
     cypher = """
         MATCH (a:Company {name: $a})-[:PARTNERS_WITH]->(p:Partner)<-[:PARTNERS_WITH]-(b:Company {name: $b})
         RETURN p.name AS partner
     """
-    return [r["partner"] for r in neo4j_client.run_query(cypher, {"a": company_a, "b": company_b})]
+    return [r["partner"] for r in await neo4j_client.run_query(cypher, {"a": company_a, "b": company_b})]
+
 
+@cached_read
+async def find_common_partners_matrix(companies: tuple[str, ...],
+                                      rel_types: tuple[str, ...] = ("PARTNERS_WITH",)) -> dict:
+    """Common partners for every pair in *companies* in one pass.
 
-def get_company_exposure(entity: str) -> list[dict]:
+    Same semantics as find_common_partners (both companies point at the partner), with the
+    relationship types configurable. Returns {(a, b): [partners]} keyed in *companies* order,
+    including a == b (each company's own partners).
+    """
+    order = {c: i for i, c in enumerate(companies)}
     if not neo4j_client.is_connected:
-        results = []
-        for t in SEED_TRIPLES:
-            if t[4] == entity or t[1] == entity:
-                results.append({"company": t[1], "relationship": t[2], "entity": t[4]})
+        # Sparse B·Bᵀ via an inverted index: partner -> cohort companies pointing at it
+        by_partner = defaultdict(set)
+        for company in companies:
+            node = memory_graph.node_id(company)
+            for rel in rel_types:
+                for partner in memory_graph.out_neighbours(node, rel):
+                    by_partner[partner].add(company)
+        shared = defaultdict(list)
+        for partner, members in by_partner.items():
+            for a, b in combinations_with_replacement(sorted(members, key=order.get), 2):
+                shared[(a, b)].append(memory_graph.name(partner))
+        return dict(shared)
+
+    cypher = """
+        UNWIND $companies AS name
+        MATCH (c:Company {name: name})-[r]->(p)
+        WHERE type(r) IN $rels
+        WITH p, collect(DISTINCT c.name) AS members
+        UNWIND members AS a
+        UNWIND members AS b
+        WITH a, b, p WHERE $order[a] <= $order[b]
+        RETURN a, b, collect(DISTINCT p.name) AS partners
+    """
+    rows = await neo4j_client.run_query(
+        cypher, {"companies": list(companies), "rels": list(rel_types), "order": order},
+    )
+    return {(r["a"], r["b"]): r["partners"] for r in rows}
+
+
+@cached_read
+async def get_company_exposure(entity: str) -> list[dict]:
+    if not neo4j_client.is_connected:
+        node = memory_graph.node_id(entity)
+        if node is None:
+            return []
+        results = [
+            {"company": memory_graph.name(src), "relationship": rel, "entity": entity}
+            for rel, src in memory_graph.in_edges(node)
+        ]
+        results.extend(
+            {"company": entity, "relationship": rel, "entity": memory_graph.name(tgt)}
+            for rel, tgt in memory_graph.out_edges(node)
+        )
         return results
 
     cypher = """
         MATCH (c:Company)-[r]->(x {name: $entity})
         RETURN c.name AS company, type(r) AS relationship, x.name AS entity
     """
-    return neo4j_client.run_query(cypher, {"entity": entity})
+    return await neo4j_client.run_query(cypher, {"entity": entity})
 
 
-def run_raw_cypher(cypher: str) -> list[dict]:
+async def run_raw_cypher(cypher: str) -> list[dict]:
+    """Run generated Cypher through the guard. Raises CypherRejected if it fails a check."""
     if not neo4j_client.is_connected:
         return [{"info": "Demo mode — raw Cypher not available. Showing full demo graph.", **get_demo_graph_data()}]
-    return neo4j_client.run_query(cypher)
+    return [row async for row in guarded_query(cypher)]
@@ -2,6 +2,7 @@
 Graph schema — creates constraints, indexes, and base data in Neo4j.
 """
 from graph.neo4j_client import neo4j_client
+from graph.bulk_ingest import ingest_triples
 
 SCHEMA_STATEMENTS = [
     "CREATE CONSTRAINT IF NOT EXISTS FOR (c:Company)  REQUIRE c.name IS UNIQUE",
@@ -14,10 +15,10 @@ SCHEMA_STATEMENTS = [
 ]
 
 
-def init_schema():
+async def init_schema():
     """Run all schema statements (no-op in demo mode)."""
     for stmt in SCHEMA_STATEMENTS:
-        neo4j_client.run_write(stmt)
+        await neo4j_client.run_write(stmt)
 
 
 SEED_TRIPLES = [
@@ -63,15 +64,9 @@ SEED_TRIPLES = [
 ]
 
 
-def seed_graph():
+async def seed_graph() -> list[dict]:
     """Insert seed triples into Neo4j (no-op in demo mode)."""
-    for src_label, src_name, rel, tgt_label, tgt_name in SEED_TRIPLES:
-        cypher = (
-            f"MERGE (a:{src_label} {{name: $src}}) "
-            f"MERGE (b:{tgt_label} {{name: $tgt}}) "
-            f"MERGE (a)-[:{rel}]->(b)"
-        )
-        neo4j_client.run_write(cypher, {"src": src_name, "tgt": tgt_name})
+    return await ingest_triples(SEED_TRIPLES)
 
 
 def get_demo_graph_data() -> dict:
@@ -0,0 +1,148 @@
+"""
+Graph stream — incremental JSON / NDJSON serialisation of the knowledge graph.
+Nodes and edges are written as rows arrive from Neo4j (or the in-memory graph),
+so memory stays flat no matter how large the graph is.
+"""
+from graph.neo4j_client import neo4j_client
+from graph.memory_graph import memory_graph
+
+try:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str)
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    import json
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+CHUNK_BYTES = 64 * 1024
+
+
+# ------------------------------------------------------------------ sources
+async def iter_nodes(company: str | None = None):
+    """Yield {id, label, name} for every node (or every node touching *company*)."""
+    if not neo4j_client.is_connected:
+        if company:
+            for node in _memory_neighbourhood(company):
+                yield memory_graph.node(node)
+            return
+        for node in range(memory_graph.node_count):
+            yield memory_graph.node(node)
+        return
+
+    if company:
+        cypher = """
+            MATCH (c {name: $company})
+            OPTIONAL MATCH (c)--(n)
+            WITH collect(DISTINCT c) + collect(DISTINCT n) AS ns
+            UNWIND ns AS n
+            WITH DISTINCT n WHERE n IS NOT NULL
+            RETURN labels(n)[0] AS label, n.name AS name
+        """
+    else:
+        cypher = "MATCH (n) RETURN labels(n)[0] AS label, n.name AS name"
+    async for r in neo4j_client.stream_query(cypher, {"company": company}):
+        yield {"id": r["name"], "label": r["label"], "name": r["name"]}
+
+
+async def iter_edges(company: str | None = None):
+    """Yield {source, target, relationship} for every edge (or every edge touching *company*)."""
+    if not neo4j_client.is_connected:
+        for src, rel, tgt, _, _ in memory_graph.sorted_edges():
+            if company is None or company in (src, tgt):
+                yield {"source": src, "target": tgt, "relationship": rel}
+        return
+
+    where = "WHERE a.name = $company OR b.name = $company" if company else ""
+    cypher = f"""
+        MATCH (a)-[r]->(b)
+        {where}
+        RETURN a.name AS src, type(r) AS rel, b.name AS tgt
+    """
+    async for r in neo4j_client.stream_query(cypher, {"company": company}):
+        yield {"source": r["src"], "target": r["tgt"], "relationship": r["rel"]}
+
+
+async def iter_triples():
+    """Yield every edge as a (src_label, src_name, rel, tgt_label, tgt_name) tuple."""
+    if not neo4j_client.is_connected:
+        for triple in memory_graph.triples():
+            yield triple
+        return
+
+    cypher = """
+        MATCH (a)-[r]->(b)
+        RETURN labels(a)[0] AS src_label, a.name AS src, type(r) AS rel, labels(b)[0] AS tgt_label, b.name AS tgt
+    """
+    async for r in neo4j_client.stream_query(cypher):
+        yield r["src_label"], r["src"], r["rel"], r["tgt_label"], r["tgt"]
+
+
+def _memory_neighbourhood(company: str) -> list[int]:
+    node = memory_graph.node_id(company)
+    if node is None:
+        return []
+    seen = {node}
+    seen.update(tgt for _, tgt in memory_graph.out_edges(node))
+    seen.update(src for _, src in memory_graph.in_edges(node))
+    return sorted(seen)
+
+
+# ------------------------------------------------------------------ writers
+async def _chunked(pieces):
+    """Coalesce small byte pieces into ~CHUNK_BYTES writes. The first piece is sent at once."""
+    buf, size, first = [], 0, True
+    async for piece in pieces:
+        buf.append(piece)
+        size += len(piece)
+        if size >= CHUNK_BYTES or first:
+            first = False
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
+
+
+async def _json_array(items):
+    yield b"["
+    first = True
+    async for item in items:
+        yield dumps(item) if first else b"," + dumps(item)
+        first = False
+    yield b"]"
+
+
+async def _graph_json_pieces(company: str | None, prefix: dict | None):
+    yield b"{"
+    if prefix:
+        for key, value in prefix.items():
+            yield dumps(key) + b":" + dumps(value) + b","
+        yield b'"graph":{'
+    yield b'"nodes":'
+    async for piece in _json_array(iter_nodes(company)):
+        yield piece
+    yield b',"edges":'
+    async for piece in _json_array(iter_edges(company)):
+        yield piece
+    yield b"}}" if prefix else b"}"
+
+
+def stream_graph_json(company: str | None = None, prefix: dict | None = None):
+    """Stream {"nodes": [...], "edges": [...]} — or, with *prefix*, {**prefix, "graph": {...}}."""
+    return _chunked(_graph_json_pieces(company, prefix))
+
+
+async def _graph_ndjson_pieces(company: str | None, header: dict | None):
+    if header:
+        yield dumps({"type": "header", **header}) + b"\n"
+    async for node in iter_nodes(company):
+        yield dumps({"type": "node", **node}) + b"\n"
+    async for edge in iter_edges(company):
+        yield dumps({"type": "edge", **edge}) + b"\n"
+
+
+def stream_graph_ndjson(company: str | None = None, header: dict | None = None):
+    """Stream one JSON object per line: optional header, then nodes, then edges."""
+    return _chunked(_graph_ndjson_pieces(company, header))
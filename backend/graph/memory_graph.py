@@ -0,0 +1,209 @@
+"""
+Memory graph — compact in-memory triple store for demo/offline graph queries.
+Node names, labels and relationship types are interned to integer IDs. Edges are
+kept in flat arrays and frozen on demand into CSR (offsets + neighbours) forward
+and reverse adjacency per relationship type, plus a per-label node index.
+"""
+from array import array
+from graph.graph_schema import SEED_TRIPLES
+from graph.read_cache import bump_graph_version
+
+
+def _csr(pairs: list[tuple[int, int]], n: int) -> tuple[array, array]:
+    """Build (offsets, neighbours) so neighbours[offsets[i]:offsets[i+1]] are i's neighbours."""
+    offsets = array("I", [0]) * (n + 1)
+    for src, _ in pairs:
+        offsets[src + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    neighbours = array("I", [0]) * len(pairs)
+    cursor = array("I", offsets)
+    for src, tgt in pairs:
+        neighbours[cursor[src]] = tgt
+        cursor[src] += 1
+    return offsets, neighbours
+
+
+class MemoryGraph:
+    def __init__(self, triples: list[tuple] | None = None):
+        self.clear()
+        if triples:
+            self.add_triples(triples)
+
+    def clear(self):
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        self._lower: list[str] = []
+        self._by_lower: dict[str, list[int]] = {}
+        self._node_label = array("H")
+        self._label_ids: dict[str, int] = {}
+        self._label_names: list[str] = []
+        self._rel_ids: dict[str, int] = {}
+        self._rel_names: list[str] = []
+        self._src, self._rel, self._tgt = array("I"), array("H"), array("I")
+        self._edge_set: set[tuple[int, int, int]] = set()
+        self._fwd: dict[int, tuple[array, array]] = {}
+        self._rev: dict[int, tuple[array, array]] = {}
+        self._by_label: dict[int, array] = {}
+        self._sorted: list[tuple] | None = None
+        self._dirty = False
+
+    # ------------------------------------------------------------------ build
+    def _intern(self, table: dict, names: list, value: str) -> int:
+        idx = table.get(value)
+        if idx is None:
+            idx = table[value] = len(names)
+            names.append(value)
+        return idx
+
+    def _node(self, label: str, name: str) -> int:
+        label_id = self._intern(self._label_ids, self._label_names, label)
+        idx = self._ids.get(name)
+        if idx is None:
+            idx = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._lower.append(name.lower())
+            self._by_lower.setdefault(name.lower(), []).append(idx)
+            self._node_label.append(label_id)
+        else:
+            self._node_label[idx] = label_id  # last label seen wins, as in get_demo_graph_data
+        return idx
+
+    def add_triples(self, triples):
+        """Add (src_label, src_name, rel, tgt_label, tgt_name) tuples; duplicates are ignored."""
+        for src_label, src_name, rel, tgt_label, tgt_name in triples:
+            edge = (self._node(src_label, src_name), self._intern(self._rel_ids, self._rel_names, rel),
+                    self._node(tgt_label, tgt_name))
+            if edge in self._edge_set:
+                continue
+            self._edge_set.add(edge)
+            self._src.append(edge[0])
+            self._rel.append(edge[1])
+            self._tgt.append(edge[2])
+            self._sorted = None
+            self._dirty = True
+        bump_graph_version()
+
+    def add_nodes(self, nodes):
+        """Add (label, name) nodes, including ones that have no edges."""
+        for label, name in nodes:
+            if name not in self._ids:
+                self._node(label, name)
+                self._dirty = True
+        bump_graph_version()
+
+    def load(self, triples, nodes=None):
+        """Replace the whole graph with *triples* (plus any isolated *nodes*)."""
+        self.clear()
+        self.add_triples(triples)
+        if nodes:
+            self.add_nodes(nodes)
+
+    def _freeze(self):
+        if not self._dirty:
+            return
+        n = len(self._names)
+        grouped: list[list[tuple[int, int]]] = [[] for _ in self._rel_names]
+        for s, r, t in zip(self._src, self._rel, self._tgt):
+            grouped[r].append((s, t))
+        self._fwd = {r: _csr(pairs, n) for r, pairs in enumerate(grouped)}
+        self._rev = {r: _csr([(t, s) for s, t in pairs], n) for r, pairs in enumerate(grouped)}
+        by_label: dict[int, array] = {i: array("I") for i in range(len(self._label_names))}
+        for node, label_id in enumerate(self._node_label):
+            by_label[label_id].append(node)
+        self._by_label = by_label
+        self._dirty = False
+
+    # ------------------------------------------------------------------ lookup
+    def __len__(self) -> int:
+        return len(self._src)
+
+    @property
+    def node_count(self) -> int:
+        return len(self._names)
+
+    def node_id(self, name: str) -> int | None:
+        return self._ids.get(name)
+
+    def name(self, node: int) -> str:
+        return self._names[node]
+
+    def label(self, node: int) -> str:
+        return self._label_names[self._node_label[node]]
+
+    def node(self, node: int) -> dict:
+        name = self._names[node]
+        return {"id": name, "label": self.label(node), "name": name}
+
+    @property
+    def labels(self) -> list[str]:
+        return list(self._label_names)
+
+    @property
+    def relationship_types(self) -> list[str]:
+        return list(self._rel_names)
+
+    def find_nodes(self, text: str) -> list[int]:
+        """IDs of nodes named *text* (case-insensitive); falls back to a substring scan."""
+        text = text.lower()
+        exact = self._by_lower.get(text)
+        if exact:
+            return exact
+        return [i for i, name in enumerate(self._lower) if text in name]
+
+    def nodes_with_label(self, label: str):
+        self._freeze()
+        label_id = self._label_ids.get(label)
+        return self._by_label.get(label_id, array("I")) if label_id is not None else array("I")
+
+    def _neighbours(self, reverse: bool, node: int, rel: str):
+        self._freeze()
+        rel_id = self._rel_ids.get(rel)
+        if rel_id is None or node is None:
+            return ()
+        offsets, neighbours = (self._rev if reverse else self._fwd)[rel_id]
+        return neighbours[offsets[node]:offsets[node + 1]]
+
+    def out_neighbours(self, node: int, rel: str):
+        return self._neighbours(False, node, rel)
+
+    def in_neighbours(self, node: int, rel: str):
+        return self._neighbours(True, node, rel)
+
+    def out_edges(self, node: int):
+        """Yield (rel, target) for every outgoing edge of *node*."""
+        for rel in self._rel_names:
+            for tgt in self.out_neighbours(node, rel):
+                yield rel, tgt
+
+    def in_edges(self, node: int):
+        """Yield (rel, source) for every incoming edge of *node*."""
+        for rel in self._rel_names:
+            for src in self.in_neighbours(node, rel):
+                yield rel, src
+
+    def sorted_edges(self) -> list[tuple[str, str, str, int, int]]:
+        """Edges as (src_name, rel, tgt_name, src_id, tgt_id), sorted for keyset pagination."""
+        if self._sorted is None:
+            self._sorted = sorted(
+                (self._names[s], self._rel_names[r], self._names[t], s, t)
+                for s, r, t in zip(self._src, self._rel, self._tgt)
+            )
+        return self._sorted
+
+    def triples(self):
+        """Yield every edge as a (src_label, src_name, rel, tgt_label, tgt_name) tuple."""
+        for s, r, t in zip(self._src, self._rel, self._tgt):
+            yield self.label(s), self._names[s], self._rel_names[r], self.label(t), self._names[t]
+
+    def to_graph_data(self) -> dict:
+        return {
+            "nodes": [self.node(i) for i in range(len(self._names))],
+            "edges": [
+                {"source": self._names[s], "target": self._names[t], "relationship": self._rel_names[r]}
+                for s, r, t in zip(self._src, self._rel, self._tgt)
+            ],
+        }
+
+
+memory_graph = MemoryGraph(SEED_TRIPLES)
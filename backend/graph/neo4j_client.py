@@ -1,9 +1,10 @@
 """
-Neo4j client — singleton driver with demo-mode fallback.
+Neo4j client — singleton async driver with demo-mode fallback.
 """
 import logging
-from neo4j import GraphDatabase
+from neo4j import AsyncGraphDatabase, Query, READ_ACCESS, WRITE_ACCESS
 from config import settings
+from graph.read_cache import bump_graph_version
 
 logger = logging.getLogger(__name__)
 
@@ -18,42 +19,82 @@ class Neo4jClient:
         return cls._instance
 
     # ------------------------------------------------------------------ #
-    def connect(self):
+    async def connect(self):
         if settings.DEMO_MODE:
             logger.info("DEMO_MODE active — Neo4j connection skipped.")
             return
         try:
-            self._driver = GraphDatabase.driver(
+            self._driver = AsyncGraphDatabase.driver(
                 settings.NEO4J_URI,
                 auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+                max_connection_pool_size=settings.NEO4J_MAX_POOL_SIZE,
+                connection_acquisition_timeout=settings.NEO4J_ACQUISITION_TIMEOUT,
             )
-            self._driver.verify_connectivity()
+            await self._driver.verify_connectivity()
             logger.info("Connected to Neo4j at %s", settings.NEO4J_URI)
         except Exception as exc:
             logger.warning("Neo4j unavailable (%s) — falling back to demo mode.", exc)
+            if self._driver:
+                await self._driver.close()
             self._driver = None
 
-    def close(self):
+    async def close(self):
         if self._driver:
-            self._driver.close()
+            await self._driver.close()
+            self._driver = None
 
     @property
     def is_connected(self) -> bool:
         return self._driver is not None
 
     # ------------------------------------------------------------------ #
-    def run_query(self, cypher: str, params: dict | None = None) -> list[dict]:
+    @staticmethod
+    def _query(cypher: str, timeout: float | None) -> Query:
+        return Query(cypher, timeout=timeout or settings.NEO4J_QUERY_TIMEOUT)
+
+    async def run_query(self, cypher: str, params: dict | None = None,
+                        timeout: float | None = None) -> list[dict]:
         if not self.is_connected:
             return []
-        with self._driver.session() as session:
-            result = session.run(cypher, params or {})
-            return [record.data() for record in result]
+        async with self._driver.session() as session:
+            result = await session.run(self._query(cypher, timeout), params or {})
+            return [record.data() async for record in result]
+
+    async def stream_query(self, cypher: str, params: dict | None = None,
+                           timeout: float | None = None, fetch_size: int = 1000, read_only: bool = False):
+        """Yield result rows as they arrive instead of materialising the whole result.
 
-    def run_write(self, cypher: str, params: dict | None = None):
+        With *read_only* the query runs in a read-access session, so the server refuses writes.
+        """
         if not self.is_connected:
             return
-        with self._driver.session() as session:
-            session.run(cypher, params or {})
+        mode = READ_ACCESS if read_only else WRITE_ACCESS
+        async with self._driver.session(fetch_size=fetch_size, default_access_mode=mode) as session:
+            result = await session.run(self._query(cypher, timeout), params or {})
+            async for record in result:
+                yield record.data()
+
+    async def explain(self, cypher: str, params: dict | None = None,
+                      timeout: float | None = None) -> dict | None:
+        """Return the planner's plan for *cypher* without executing it."""
+        if not self.is_connected:
+            return None
+        async with self._driver.session(default_access_mode=READ_ACCESS) as session:
+            result = await session.run(self._query(f"EXPLAIN {cypher}", timeout), params or {})
+            summary = await result.consume()
+            return summary.plan
+
+    async def run_write(self, cypher: str, params: dict | None = None,
+                        timeout: float | None = None):
+        if not self.is_connected:
+            return
+        try:
+            async with self._driver.session() as session:
+                result = await session.run(self._query(cypher, timeout), params or {})
+                await result.consume()
+        finally:
+            # Invalidate cached reads even if the write failed part-way
+            bump_graph_version()
 
 
 neo4j_client = Neo4jClient()
@@ -0,0 +1,68 @@
+"""
+Read cache — in-process cache for graph read queries.
+Entries are tagged with the graph version current when they were computed; any
+write through neo4j_client bumps the version, so stale entries are never served.
+Writes this process cannot see (another uvicorn worker, `python -m graph.snapshot
+load`) are picked up once entries expire after GRAPH_READ_CACHE_TTL seconds.
+Concurrent identical calls share one in-flight database query.
+"""
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from config import settings
+
+_graph_version = 0
+_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+
+def graph_version() -> int:
+    return _graph_version
+
+
+def bump_graph_version():
+    global _graph_version
+    _graph_version += 1
+
+
+def cache_stats() -> dict:
+    return {**_stats, "graph_version": _graph_version}
+
+
+def cached_read(func):
+    """Cache an async graph read by its arguments. Cached results are shared — treat them as read-only."""
+    cache: OrderedDict = OrderedDict()
+    inflight: dict = {}
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        version = _graph_version
+        hit = cache.get(key)
+        if hit is not None and hit[0] == version and time.monotonic() < hit[1]:
+            cache.move_to_end(key)
+            _stats["hits"] += 1
+            return hit[2]
+
+        task = inflight.get((key, version))
+        if task is not None:
+            _stats["coalesced"] += 1
+            return await asyncio.shield(task)
+
+        _stats["misses"] += 1
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        inflight[(key, version)] = task
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            inflight.pop((key, version), None)
+        if _graph_version == version:
+            ttl = settings.GRAPH_READ_CACHE_TTL
+            cache[key] = (version, time.monotonic() + ttl if ttl > 0 else float("inf"), value)
+            cache.move_to_end(key)
+            while len(cache) > settings.GRAPH_READ_CACHE_SIZE:
+                cache.popitem(last=False)
+        return value
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
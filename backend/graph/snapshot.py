@@ -0,0 +1,226 @@
+"""
+Graph snapshot — versioned, checksummed binary dump of the knowledge graph.
+A snapshot is a fixed header followed by a zlib body holding an interned string
+table (labels, relationship types, node names) and flat integer arrays for node
+labels and edges, so a whole graph can be restored without replaying the pipeline.
+
+    python -m graph.snapshot dump graph.snap
+    python -m graph.snapshot load graph.snap
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import struct
+import sys
+import zlib
+from array import array
+from config import settings
+from graph.neo4j_client import neo4j_client
+from graph.memory_graph import memory_graph
+from graph.graph_stream import iter_nodes, iter_triples
+from graph.graph_schema import seed_graph
+from graph.bulk_ingest import ingest_triples, ingest_nodes
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CIGS"
+VERSION = 1
+# magic, version, flags, node count, edge count, body length, sha256 of the body
+_HEADER = struct.Struct("<4sHHIII32s")
+
+
+class SnapshotError(ValueError):
+    """The file is not a snapshot this version can read, or it is corrupt."""
+
+
+# ------------------------------------------------------------------ encoding
+def _pack_strings(values: list[str]) -> bytes:
+    data = "\0".join(values).encode("utf-8")
+    return struct.pack("<II", len(values), len(data)) + data
+
+
+def _unpack_strings(body: bytes, offset: int) -> tuple[list[str], int]:
+    count, size = struct.unpack_from("<II", body, offset)
+    offset += 8
+    values = body[offset:offset + size].decode("utf-8").split("\0") if count else []
+    if len(values) != count:
+        raise SnapshotError("String table is corrupt")
+    return values, offset + size
+
+
+def _pack_array(typecode: str, values) -> bytes:
+    arr = array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _unpack_array(typecode: str, body: bytes, offset: int, count: int) -> tuple[array, int]:
+    arr = array(typecode)
+    size = arr.itemsize * count
+    arr.frombytes(body[offset:offset + size])
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr, offset + size
+
+
+def encode_snapshot(nodes, edges) -> bytes:
+    """Encode (label, name) nodes and (src_label, src_name, rel, tgt_label, tgt_name) edges.
+
+    Nodes are keyed on (label, name), so same-named nodes with different labels stay
+    distinct. Edge endpoints missing from *nodes* are added to the node table.
+    """
+    label_ids: dict[str, int] = {}
+    rel_ids: dict[str, int] = {}
+    ids: dict[tuple[str, str], int] = {}
+    names, node_label = [], []
+
+    def node_id(label, name):
+        idx = ids.get((label, name))
+        if idx is None:
+            idx = ids[(label, name)] = len(names)
+            names.append(name)
+            node_label.append(label_ids.setdefault(label, len(label_ids)))
+        return idx
+
+    for label, name in nodes:
+        if name is not None:
+            node_id(label, name)
+
+    src, rel, tgt = array("I"), array("H"), array("I")
+    for src_label, s, r, tgt_label, t in edges:
+        if s is None or t is None:
+            continue
+        src.append(node_id(src_label, s))
+        rel.append(rel_ids.setdefault(r, len(rel_ids)))
+        tgt.append(node_id(tgt_label, t))
+
+    body = zlib.compress(b"".join([
+        _pack_strings(list(label_ids)),
+        _pack_strings(list(rel_ids)),
+        _pack_strings(names),
+        _pack_array("H", node_label),
+        _pack_array("I", src),
+        _pack_array("H", rel),
+        _pack_array("I", tgt),
+    ]), 6)
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(names), len(src), len(body), hashlib.sha256(body).digest())
+    return header + body
+
+
+def decode_snapshot(data: bytes) -> tuple[list[tuple[str, str]], list[tuple]]:
+    """Decode a snapshot into ((label, name) nodes, (src_label, src, rel, tgt_label, tgt) triples)."""
+    if len(data) < _HEADER.size:
+        raise SnapshotError("File is too short to be a graph snapshot")
+    magic, version, _, n_nodes, n_edges, size, checksum = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Not a graph snapshot")
+    if version > VERSION:
+        raise SnapshotError(f"Snapshot version {version} is newer than supported version {VERSION}")
+    body = data[_HEADER.size:]
+    if len(body) != size or hashlib.sha256(body).digest() != checksum:
+        raise SnapshotError("Snapshot checksum mismatch")
+
+    body = zlib.decompress(body)
+    labels, offset = _unpack_strings(body, 0)
+    rels, offset = _unpack_strings(body, offset)
+    names, offset = _unpack_strings(body, offset)
+    if len(names) != n_nodes:
+        raise SnapshotError("Node table does not match the header")
+    node_label, offset = _unpack_array("H", body, offset, n_nodes)
+    src, offset = _unpack_array("I", body, offset, n_edges)
+    rel, offset = _unpack_array("H", body, offset, n_edges)
+    tgt, offset = _unpack_array("I", body, offset, n_edges)
+    if offset != len(body):
+        raise SnapshotError("Edge arrays do not match the header")
+
+    nodes = [(labels[node_label[i]], names[i]) for i in range(n_nodes)]
+    triples = [
+        (labels[node_label[s]], names[s], rels[r], labels[node_label[t]], names[t])
+        for s, r, t in zip(src, rel, tgt)
+    ]
+    return nodes, triples
+
+
+# ------------------------------------------------------------------ dump / restore
+async def write_snapshot(path: str) -> dict:
+    """Dump the current graph (Neo4j, or the memory graph offline) to *path*."""
+    nodes = [(n["label"], n["name"]) async for n in iter_nodes()]
+    edges = [triple async for triple in iter_triples()]
+    data = await asyncio.to_thread(encode_snapshot, nodes, edges)
+
+    def _write():
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    await asyncio.to_thread(_write)
+    logger.info("Wrote graph snapshot %s (%d nodes, %d edges, %d bytes)", path, len(nodes), len(edges), len(data))
+    return {"nodes": len(nodes), "edges": len(edges), "bytes": len(data)}
+
+
+def read_snapshot(path: str) -> tuple[list[tuple[str, str]], list[tuple]]:
+    with open(path, "rb") as f:
+        return decode_snapshot(f.read())
+
+
+async def restore_snapshot(path: str) -> dict:
+    """Load a snapshot into Neo4j when connected, otherwise into the memory graph."""
+    nodes, triples = await asyncio.to_thread(read_snapshot, path)
+    connected = {(t[0], t[1]) for t in triples} | {(t[3], t[4]) for t in triples}
+    isolated = [n for n in nodes if n not in connected]
+    if neo4j_client.is_connected:
+        stats = await ingest_triples(triples) + await ingest_nodes(isolated)
+        target = "neo4j"
+    else:
+        memory_graph.load(triples, isolated)
+        stats = []
+        target = "memory"
+    logger.info("Restored %d triples and %d isolated nodes from %s into %s", len(triples), len(isolated), path, target)
+    return {"triples": len(triples), "isolated_nodes": len(isolated), "batches": len(stats), "target": target}
+
+
+async def is_seeded() -> bool:
+    """True if Neo4j already holds any nodes."""
+    rows = await neo4j_client.run_query("MATCH (n) RETURN 1 AS found LIMIT 1")
+    return bool(rows)
+
+
+async def bootstrap_graph() -> str:
+    """Populate the graph at startup: keep an existing graph, else restore the snapshot, else seed."""
+    if neo4j_client.is_connected and await is_seeded():
+        logger.info("Graph already populated — skipping seed.")
+        return "existing"
+    path = settings.GRAPH_SNAPSHOT_PATH
+    if path and os.path.exists(path):
+        try:
+            await restore_snapshot(path)
+            return "snapshot"
+        except (OSError, SnapshotError) as exc:
+            logger.error("Could not restore graph snapshot %s: %s — seeding instead.", path, exc)
+    await seed_graph()
+    return "seed"
+
+
+# ------------------------------------------------------------------ CLI
+async def _main(args):
+    await neo4j_client.connect()
+    try:
+        if args.command == "dump":
+            print(await write_snapshot(args.path))
+        else:
+            print(await restore_snapshot(args.path))
+    finally:
+        await neo4j_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dump or restore a binary knowledge graph snapshot.")
+    parser.add_argument("command", choices=["dump", "load"])
+    parser.add_argument("path")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
@@ -1,21 +1,43 @@
 """
 FastAPI main server — Competitive Intelligence Orchestrator.
-Endpoints: /analyze, /cohort, /graph/query, /export, /comparison, /health
+Endpoints: /analyze, /analyze/stream, /jobs, /cohort, /graph/query, /graph/query/stream, /analytics, /export, /comparison, /health, /health/live, /health/ready
 """
-import csv
-import io
+import asyncio
+import importlib
 import json
 import logging
-from fastapi import FastAPI, Query
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
-
-from config import settings
-from graph.neo4j_client import neo4j_client
-from graph.graph_schema import init_schema, seed_graph, get_demo_graph_data
-from graph.graph_queries import get_subgraph, find_common_partners, get_company_exposure, run_raw_cypher
-from agents.orchestrator import run_pipeline, DEMO_SUMMARY, DEMO_COMPARISON
-from agents.reasoning_agent import run_reasoning, nl_to_cypher
+import os
+from startup import import_profile, warmup
+
+with import_profile.measure():
+    from fastapi import FastAPI, Query, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import StreamingResponse, JSONResponse, FileResponse, Response
+    from starlette.background import BackgroundTask
+
+    from config import settings
+    from graph.neo4j_client import neo4j_client
+    from graph.read_cache import cache_stats
+    from tools.http_client import http_client
+    from tools.crawl_cache import crawl_cache
+    from tools.pdf_report import get_report_pdf, shutdown_executor, prewarm as prewarm_pdf
+    from tools.csv_export import stream_csv
+    from tools import arrow_export
+    from agents.llm_cache import extraction_cache, cypher_cache
+    from agents.llm_provider import llm_provider
+    from graph.graph_schema import init_schema, get_demo_graph_data
+    from graph.snapshot import bootstrap_graph
+    from graph.graph_stream import stream_graph_json, stream_graph_ndjson, dumps
+    from graph.cypher_guard import guarded_query
+    from graph import analytics
+    from graph.analytics import graph_analytics
+    from graph.graph_queries import (
+        get_subgraph_page, find_common_partners, find_common_partners_matrix,
+        get_company_exposure, run_raw_cypher,
+    )
+    from agents.orchestrator import DEMO_SUMMARY, DEMO_COMPARISON
+    from agents.reasoning_agent import run_reasoning, translate_question, remember_cypher, forget_cypher
+    from agents.job_queue import job_queue, QueueFullError
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,20 +58,79 @@ app.add_middleware(
 )
 
 
+# ------------------------------------------------------------------ Lifecycle
+async def _warm_graph():
+    await neo4j_client.connect()
+    await init_schema()
+    graph_source = await bootstrap_graph()
+    graph_analytics.schedule_refresh()
+    logger.info("Graph ready (neo4j_connected=%s, graph=%s)", neo4j_client.is_connected, graph_source)
+
+
+async def _warm_jobs():
+    # Wait for the graph step so queued jobs see a populated graph, but start even if it
+    # failed — the pipeline runs without Neo4j
+    status = await warmup.settled("neo4j")
+    job_queue.start()
+    if status != "ready":
+        logger.warning("Job workers started without a warm graph (neo4j step %s)", status)
+
+
+async def _warm_http():
+    await asyncio.to_thread(http_client.start)
+
+
+async def _warm_llm():
+    # Building the client imports the provider's langchain package
+    await asyncio.to_thread(llm_provider.start)
+
+
+async def _warm_parsers():
+    await asyncio.to_thread(importlib.import_module, "bs4")
+
+
 @app.on_event("startup")
 async def startup():
-    neo4j_client.connect()
-    init_schema()
-    seed_graph()
+    logger.info("Imports took %.0f ms; slowest: %s", import_profile.total_ms,
+                ", ".join(f"{m['module']} {m['self_ms']:.0f}ms" for m in import_profile.slowest(5)))
+    # Heavy initialisation runs after the server binds; /health/ready reports when it is done
+    warmup.start([
+        ("neo4j", _warm_graph, True),
+        ("jobs", _warm_jobs, True),
+        ("http", _warm_http, True),
+        ("llm", _warm_llm, True),
+        ("parsers", _warm_parsers, False),
+        ("pdf", prewarm_pdf, False),
+    ])
     logger.info("🚀 Competitive Intelligence Orchestrator started (demo_mode=%s)", settings.DEMO_MODE)
 
 
 @app.on_event("shutdown")
 async def shutdown():
-    neo4j_client.close()
+    await warmup.stop()
+    await job_queue.stop()
+    await http_client.close()
+    shutdown_executor()
+    await neo4j_client.close()
 
 
 # ------------------------------------------------------------------ Health
+@app.get("/health/live")
+async def health_live():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: Neo4j, the HTTP pool and the LLM client are warm. 503 until then."""
+    status = {
+        **warmup.status(),
+        "imports": {"total_ms": import_profile.total_ms, "slowest": import_profile.slowest()},
+    }
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
 @app.get("/health")
 async def health():
     return {
@@ -57,6 +138,11 @@ async def health():
         "demo_mode": settings.DEMO_MODE,
         "neo4j_connected": neo4j_client.is_connected,
         "llm_provider": settings.LLM_PROVIDER,
+        "crawl_cache": crawl_cache.stats(),
+        "extraction_cache": extraction_cache.stats(),
+        "cypher_cache": cypher_cache.stats(),
+        "llm_metrics": llm_provider.metrics(),
+        "graph_read_cache": cache_stats(),
     }
 
 
@@ -67,32 +153,147 @@ async def get_cohort():
 
 
 # ------------------------------------------------------------------ Analyze
-@app.post("/analyze")
-async def analyze(query: str = "How is Infosys positioning differently than TCS in GenAI for 2026?"):
-    """Run full intelligence pipeline."""
-    result = await run_pipeline(query)
-    return result
+@app.post("/analyze", status_code=202)
+async def analyze(query: str = "How is Infosys positioning differently than TCS in GenAI for 2026?",
+                  incremental: bool = False):
+    """Queue a full intelligence pipeline run. Poll /jobs/{job_id} for progress.
+
+    With incremental=true only companies whose sources changed are re-extracted.
+    """
+    if not job_queue.is_running:
+        return JSONResponse(status_code=503, content={"error": "Service is warming up — retry shortly"})
+    try:
+        job = job_queue.submit(query, incremental)
+    except QueueFullError as exc:
+        return JSONResponse(status_code=429, content={"error": str(exc)})
+    return {"job_id": job["id"], **job}
+
+
+# ------------------------------------------------------------------ Jobs
+@app.get("/jobs")
+async def list_jobs():
+    return {"jobs": job_queue.recent()}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown job: {job_id}"})
+    return job
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = job_queue.get(job_id, with_result=True)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown job: {job_id}"})
+    if job["result"] is None:
+        return JSONResponse(status_code=409, content={"error": f"Job is {job['status']}", "status": job["status"]})
+    return job["result"]
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown job: {job_id}"})
+    return job
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.get("/analyze/stream")
+async def analyze_stream(query: str = "How is Infosys positioning differently than TCS in GenAI for 2026?",
+                         incremental: bool = False):
+    """Queue a pipeline run like POST /analyze and stream its progress as Server-Sent Events.
+
+    Events: job (the queued job), status, crawl (per company), extraction (per company),
+    reasoning, result (final pipeline state). A request matching an active job follows
+    that job. Disconnecting stops the stream, not the job.
+    """
+    if not job_queue.is_running:
+        return JSONResponse(status_code=503, content={"error": "Service is warming up — retry shortly"})
+    try:
+        job = job_queue.submit(query, incremental)
+    except QueueFullError as exc:
+        return JSONResponse(status_code=429, content={"error": str(exc)})
+    # Subscribe before yielding control so no event of a new job is missed
+    queue = job_queue.subscribe(job["id"])
+
+    async def events():
+        try:
+            yield _sse("job", {"job_id": job["id"], **job})
+            if job["stage"]:
+                yield _sse("status", {"status": job["stage"]})  # joined a job that is already running
+            while (item := await queue.get()) is not None:
+                yield _sse(*item)
+        finally:
+            job_queue.unsubscribe(job["id"], queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ------------------------------------------------------------------ Graph
+def _csv_param(value: str | None) -> tuple[str, ...]:
+    return tuple(v.strip() for v in value.split(",") if v.strip()) if value else ()
+
+
 @app.get("/graph")
-async def get_graph(company: str = None):
-    """Get graph data, optionally filtered by company."""
-    data = get_subgraph(company)
-    if not data.get("nodes"):
-        data = get_demo_graph_data()
+async def get_graph(company: str = None, cursor: str = None, page_size: int = None,
+                    labels: str = None, rel_types: str = None):
+    """Get one page of graph data, optionally filtered by company, labels and relationship types.
+
+    labels / rel_types are comma-separated. Pass the returned next_cursor to fetch the next page.
+    """
+    page_size = min(max(page_size or settings.GRAPH_PAGE_SIZE, 1), settings.GRAPH_MAX_PAGE_SIZE)
+    try:
+        data = await get_subgraph_page(cursor, page_size, _csv_param(labels), _csv_param(rel_types), company)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+    if not data.get("nodes") and not (cursor or company or labels or rel_types):
+        data = {**get_demo_graph_data(), "next_cursor": None}
     return data
 
 
+@app.get("/graph/stream")
+async def stream_graph(company: str = None, format: str = "json"):
+    """Stream the whole graph (or a company's neighbourhood) as JSON or NDJSON without paging."""
+    if format == "ndjson":
+        return StreamingResponse(stream_graph_ndjson(company), media_type="application/x-ndjson")
+    return StreamingResponse(stream_graph_json(company), media_type="application/json")
+
+
 @app.post("/graph/query")
 async def graph_query(question: str = "Show all Infosys relationships"):
-    """Natural language or Cypher graph query."""
-    # Try NL-to-Cypher
-    cypher = await nl_to_cypher(question)
-    results = run_raw_cypher(cypher)
-
-    # Also run reasoning
-    reasoning = await run_reasoning(question)
+    """Natural language or Cypher graph query.
+
+    NL-to-Cypher plus execution runs concurrently with reasoning, which does not need the results.
+    """
+    async def _query():
+        cypher, from_llm = await translate_question(question)
+        while True:
+            try:
+                results = await run_raw_cypher(cypher)
+            except Exception as exc:
+                logger.error("Generated Cypher failed: %s", exc)
+                # A cached translation that fails is evicted and translated afresh, once
+                if not from_llm and forget_cypher(question):
+                    cypher, from_llm = await translate_question(question)
+                    continue
+                return cypher, [{"error": str(exc)}]
+            # Offline, run_raw_cypher returns demo rows without checking the query, so nothing is cached
+            if from_llm and neo4j_client.is_connected:
+                remember_cypher(question, cypher)
+            return cypher, results
+
+    (cypher, results), reasoning = await asyncio.gather(_query(), run_reasoning(question))
 
     return {
         "question": question,
@@ -102,15 +303,62 @@ async def graph_query(question: str = "Show all Infosys relationships"):
     }
 
 
+@app.get("/graph/query/stream")
+async def graph_query_stream(question: str = "Show all Infosys relationships"):
+    """Translate *question* to Cypher and stream the guarded result rows as NDJSON."""
+    cypher, from_llm = await translate_question(question)
+
+    async def lines():
+        yield dumps({"type": "header", "question": question, "generated_cypher": cypher}) + b"\n"
+        if not neo4j_client.is_connected:
+            # Demo rows; the query is not checked or run, so it is never cached
+            for row in await run_raw_cypher(cypher):
+                yield dumps({"type": "row", **row}) + b"\n"
+            return
+        try:
+            async for row in guarded_query(cypher):
+                yield dumps({"type": "row", **row}) + b"\n"
+        except Exception as exc:
+            logger.error("Generated Cypher failed: %s", exc)
+            if not from_llm:
+                forget_cypher(question)  # the next request translates afresh
+            yield dumps({"type": "error", "error": str(exc)}) + b"\n"
+            return
+        if from_llm:
+            remember_cypher(question, cypher)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.get("/graph/common-partners")
 async def common_partners(company_a: str = "Infosys", company_b: str = "Accenture"):
-    partners = find_common_partners(company_a, company_b)
+    partners = await find_common_partners(company_a, company_b)
     return {"company_a": company_a, "company_b": company_b, "common_partners": partners}
 
 
+@app.get("/graph/common-partners/matrix")
+async def common_partners_matrix(companies: str = None, rel_types: str = None):
+    """Pairwise common partners across a cohort in one request.
+
+    *companies* and *rel_types* are comma-separated; they default to the configured cohort and PARTNERS_WITH.
+    """
+    cohort = tuple(dict.fromkeys(_csv_param(companies))) or tuple(settings.DEFAULT_COHORT)
+    rels = _csv_param(rel_types) or ("PARTNERS_WITH",)
+    shared = await find_common_partners_matrix(cohort, rels)
+    index = {c: i for i, c in enumerate(cohort)}
+    counts = [[0] * len(cohort) for _ in cohort]
+    pairs = []
+    for (a, b), partners in shared.items():
+        counts[index[a]][index[b]] = counts[index[b]][index[a]] = len(partners)
+        if a != b:
+            pairs.append({"company_a": a, "company_b": b, "common_partners": sorted(partners)})
+    pairs.sort(key=lambda p: (index[p["company_a"]], index[p["company_b"]]))
+    return {"companies": list(cohort), "rel_types": list(rels), "counts": counts, "pairs": pairs}
+
+
 @app.get("/graph/exposure")
 async def entity_exposure(entity: str = "NVIDIA"):
-    exposure = get_company_exposure(entity)
+    exposure = await get_company_exposure(entity)
     return {"entity": entity, "exposure": exposure}
 
 
@@ -126,99 +374,85 @@ async def summary():
     return DEMO_SUMMARY
 
 
+# ------------------------------------------------------------------ Analytics
+@app.get("/analytics")
+async def analytics_status():
+    """Which precomputed views exist, for which graph version, and whether they are stale."""
+    return graph_analytics.status()
+
+
+@app.get("/analytics/{view}")
+async def analytics_view(view: str):
+    """A precomputed view: partner-overlap, regions or centrality."""
+    if view not in analytics.ANALYTICS_VIEWS:
+        return JSONResponse(status_code=404, content={"error": f"Unknown view: {view}. Use {', '.join(analytics.ANALYTICS_VIEWS)}."})
+    if not analytics.is_available():
+        return JSONResponse(status_code=501, content={"error": "numpy and scipy are not installed"})
+    body = graph_analytics.get(view)
+    if body is None:
+        graph_analytics.schedule_refresh()
+        return JSONResponse(status_code=503, content={"error": "Analytics are still being computed — retry shortly"})
+    return Response(content=body, media_type="application/json")
+
+
 # ------------------------------------------------------------------ Export
 @app.get("/export/{fmt}")
-async def export(fmt: str):
-    """Export data in CSV, JSON, or PDF format."""
-    if fmt == "json":
-        data = {
-            "summary": DEMO_SUMMARY,
-            "comparison": DEMO_COMPARISON,
-            "graph": get_demo_graph_data(),
-        }
-        return JSONResponse(content=data, headers={
-            "Content-Disposition": "attachment; filename=intelligence_report.json"
-        })
+async def export(fmt: str, request: Request, tables: str = None):
+    """Export data in CSV, JSON, NDJSON, PDF, Parquet or Arrow format.
 
-    elif fmt == "csv":
-        output = io.StringIO()
-        if DEMO_COMPARISON:
-            writer = csv.DictWriter(output, fieldnames=DEMO_COMPARISON[0].keys())
-            writer.writeheader()
-            writer.writerows(DEMO_COMPARISON)
-        content = output.getvalue()
+    For CSV, *tables* selects comma-separated tables: comparison (default), edges, extractions.
+    For Parquet/Arrow it selects nodes, edges, extractions (default: all three, zipped).
+    """
+    if fmt == "json":
+        prefix = {"summary": DEMO_SUMMARY, "comparison": DEMO_COMPARISON}
         return StreamingResponse(
-            io.BytesIO(content.encode()),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=comparison_table.csv"},
+            stream_graph_json(prefix=prefix),
+            media_type="application/json",
+            headers={"Content-Disposition": "attachment; filename=intelligence_report.json"},
         )
 
-    elif fmt == "pdf":
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.colors import HexColor
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-        from reportlab.lib.units import inch
-
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75 * inch, bottomMargin=0.75 * inch)
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Title
-        title_style = ParagraphStyle("Title", parent=styles["Title"], textColor=HexColor("#7c3aed"), fontSize=18)
-        story.append(Paragraph(DEMO_SUMMARY["title"], title_style))
-        story.append(Spacer(1, 20))
-
-        # Strategic Positioning
-        story.append(Paragraph("<b>Strategic Positioning</b>", styles["Heading2"]))
-        story.append(Paragraph(DEMO_SUMMARY["strategic_positioning"], styles["Normal"]))
-        story.append(Spacer(1, 12))
-
-        # Strengths
-        story.append(Paragraph("<b>Strengths</b>", styles["Heading2"]))
-        for s in DEMO_SUMMARY["strengths"]:
-            story.append(Paragraph(f"• {s}", styles["Normal"]))
-        story.append(Spacer(1, 12))
-
-        # Weaknesses
-        story.append(Paragraph("<b>Weaknesses</b>", styles["Heading2"]))
-        for w in DEMO_SUMMARY["weaknesses"]:
-            story.append(Paragraph(f"• {w}", styles["Normal"]))
-        story.append(Spacer(1, 12))
-
-        # Risk
-        story.append(Paragraph("<b>Risk Outlook</b>", styles["Heading2"]))
-        risk = DEMO_SUMMARY["risk_outlook"]
-        story.append(Paragraph(f"Overall Risk: {risk['overall_risk']} (Score: {risk['risk_score']}/100)", styles["Normal"]))
-        for t in risk["primary_threats"]:
-            story.append(Paragraph(f"⚠ {t}", styles["Normal"]))
-        story.append(Spacer(1, 12))
-
-        # Comparison Table
-        story.append(Paragraph("<b>Comparison Table</b>", styles["Heading2"]))
-        if DEMO_COMPARISON:
-            headers = list(DEMO_COMPARISON[0].keys())
-            table_data = [headers] + [[row[h] for h in headers] for row in DEMO_COMPARISON]
-            t = Table(table_data, repeatRows=1)
-            t.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), HexColor("#7c3aed")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), HexColor("#ffffff")),
-                ("FONTSIZE", (0, 0), (-1, -1), 7),
-                ("GRID", (0, 0), (-1, -1), 0.5, HexColor("#cccccc")),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [HexColor("#f8f7ff"), HexColor("#ffffff")]),
-            ]))
-            story.append(t)
-
-        doc.build(story)
-        buffer.seek(0)
+    elif fmt == "ndjson":
+        header = {"summary": DEMO_SUMMARY, "comparison": DEMO_COMPARISON}
         return StreamingResponse(
-            buffer,
-            media_type="application/pdf",
-            headers={"Content-Disposition": "attachment; filename=executive_summary.pdf"},
+            stream_graph_ndjson(header=header),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": "attachment; filename=intelligence_report.ndjson"},
         )
 
-    return {"error": f"Unsupported format: {fmt}. Use json, csv, or pdf."}
+    elif fmt == "csv":
+        try:
+            selected = list(_csv_param(tables)) or ["comparison"]
+            gzip = "gzip" in request.headers.get("accept-encoding", "")
+            body = stream_csv(selected, gzip=gzip)
+        except ValueError as exc:
+            return JSONResponse(status_code=400, content={"error": str(exc)})
+        filename = "comparison_table.csv" if selected == ["comparison"] else "intelligence_export.csv"
+        headers = {"Content-Disposition": f"attachment; filename={filename}"}
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(body, media_type="text/csv", headers=headers)
+
+    elif fmt == "pdf":
+        pdf = await get_report_pdf(DEMO_SUMMARY, DEMO_COMPARISON)
+        return Response(content=pdf, media_type="application/pdf",
+                        headers={"Content-Disposition": "attachment; filename=executive_summary.pdf"})
+
+    elif fmt in arrow_export.ARROW_FORMATS:
+        if not arrow_export.is_available():
+            return JSONResponse(status_code=501, content={"error": "pyarrow is not installed"})
+        selected = list(_csv_param(tables)) or list(arrow_export.ARROW_TABLES)
+        unknown = [t for t in selected if t not in arrow_export.ARROW_TABLES]
+        if unknown:
+            return JSONResponse(status_code=400, content={"error": f"Unknown table(s): {', '.join(unknown)}"})
+        try:
+            path, filename = await arrow_export.build_export(selected, fmt)
+        except Exception as exc:
+            logger.error("Columnar export failed: %s", exc)
+            return JSONResponse(status_code=500, content={"error": str(exc)})
+        return FileResponse(path, filename=filename, media_type="application/octet-stream",
+                            background=BackgroundTask(os.remove, path))
+
+    return {"error": f"Unsupported format: {fmt}. Use json, ndjson, csv, pdf, parquet or arrow."}
 
 
 # ------------------------------------------------------------------ Run
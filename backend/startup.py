@@ -0,0 +1,109 @@
+"""
+Startup — import-time profile and the background warm-up that runs after the server binds.
+Readiness (/health/ready) flips once every required warm-up step has finished.
+"""
+import asyncio
+import builtins
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class ImportProfile:
+    """Records cumulative and self time (ms) of every module first imported while measuring."""
+
+    def __init__(self):
+        self.timings: dict[str, tuple[float, float]] = {}
+
+    @contextmanager
+    def measure(self):
+        original = builtins.__import__
+        children: list[float] = []
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            children.append(0.0)
+            started = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - started
+                nested = children.pop()
+                if children:
+                    children[-1] += elapsed
+                self.timings.setdefault(name, (elapsed * 1000, (elapsed - nested) * 1000))
+
+        builtins.__import__ = timed_import
+        try:
+            yield self
+        finally:
+            builtins.__import__ = original
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(self_ms for _, self_ms in self.timings.values()), 1)
+
+    def slowest(self, n: int = 10) -> list[dict]:
+        ranked = sorted(self.timings.items(), key=lambda item: item[1][1], reverse=True)[:n]
+        return [{"module": name, "self_ms": round(s, 1), "cumulative_ms": round(c, 1)} for name, (c, s) in ranked]
+
+
+class Warmup:
+    """Runs named warm-up steps concurrently in the background and tracks their state."""
+
+    def __init__(self):
+        self.steps: dict[str, dict] = {}
+        self._done: dict[str, asyncio.Event] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self, steps: list[tuple]):
+        """Schedule (name, async fn, required) steps. Returns immediately."""
+        for name, _, required in steps:
+            self.steps[name] = {"status": "pending", "required": required}
+            self._done[name] = asyncio.Event()
+        self._task = asyncio.create_task(self._run(steps))
+
+    async def _run(self, steps: list[tuple]):
+        started = time.perf_counter()
+        await asyncio.gather(*(self._step(name, fn) for name, fn, _ in steps))
+        logger.info("Warm-up finished in %.0f ms (ready=%s)", (time.perf_counter() - started) * 1000, self.ready)
+
+    async def _step(self, name: str, fn):
+        state = self.steps[name]
+        state["status"] = "running"
+        started = time.perf_counter()
+        try:
+            await fn()
+            state["status"] = "ready"
+        except Exception as exc:
+            logger.error("Warm-up step %s failed: %s", name, exc)
+            state.update(status="failed", error=str(exc))
+        state["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self._done[name].set()
+
+    async def settled(self, name: str) -> str:
+        """Wait until step *name* has finished, successfully or not. Returns its status."""
+        await self._done[name].wait()
+        return self.steps[name]["status"]
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.steps) and all(
+            s["status"] == "ready" for s in self.steps.values() if s["required"]
+        )
+
+    def status(self) -> dict:
+        return {"ready": self.ready, "steps": self.steps}
+
+
+import_profile = ImportProfile()
+warmup = Warmup()
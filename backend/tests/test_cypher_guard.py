@@ -0,0 +1,108 @@
+"""Static checks in graph.cypher_guard.check_cypher."""
+import pytest
+from config import settings
+from graph.cypher_guard import CypherRejected, check_cypher
+
+MAX_ROWS = settings.CYPHER_MAX_ROWS
+MAX_HOPS = settings.CYPHER_MAX_HOPS
+
+
+def test_appends_limit_when_missing():
+    assert check_cypher("MATCH (c:Company) RETURN c.name").endswith(f"LIMIT {MAX_ROWS}")
+
+
+def test_caps_large_limit():
+    cypher = check_cypher(f"MATCH (c:Company) RETURN c.name LIMIT {MAX_ROWS * 10}")
+    assert cypher == f"MATCH (c:Company) RETURN c.name LIMIT {MAX_ROWS}"
+
+
+def test_keeps_small_limit():
+    assert check_cypher("MATCH (c:Company) RETURN c.name LIMIT 5") == "MATCH (c:Company) RETURN c.name LIMIT 5"
+
+
+def test_trailing_comment_cannot_hide_limit():
+    cypher = check_cypher(f"MATCH (c:Company) RETURN c.name LIMIT {MAX_ROWS * 10} // top companies")
+    assert cypher == f"MATCH (c:Company) RETURN c.name LIMIT {MAX_ROWS}"
+
+
+def test_trailing_comment_cannot_swallow_appended_limit():
+    cypher = check_cypher("MATCH (c:Company) RETURN c.name // all of them")
+    assert cypher.splitlines()[-1] == f"LIMIT {MAX_ROWS}"
+    assert "//" not in cypher
+
+
+def test_rejects_parameterised_limit():
+    with pytest.raises(CypherRejected, match="parameterised LIMIT"):
+        check_cypher("MATCH (c:Company) RETURN c.name LIMIT $n")
+
+
+def test_rejects_multiple_statements():
+    with pytest.raises(CypherRejected, match="multiple statements"):
+        check_cypher("MATCH (c) RETURN c; MATCH (n) DETACH DELETE n")
+
+
+def test_allows_semicolon_inside_string():
+    cypher = check_cypher("MATCH (c:Company {name: 'A; B'}) RETURN c.name")
+    assert "'A; B'" in cypher
+
+
+def test_keeps_double_slash_inside_string():
+    cypher = check_cypher("MATCH (c:Company) WHERE c.url = 'https://example.com' RETURN c.name LIMIT 5")
+    assert cypher == "MATCH (c:Company) WHERE c.url = 'https://example.com' RETURN c.name LIMIT 5"
+
+
+def test_limit_inside_string_is_not_trailing():
+    cypher = check_cypher("MATCH (c:Company) WHERE c.name = 'LIMIT 5' RETURN c.name")
+    assert cypher.endswith(f"LIMIT {MAX_ROWS}")
+
+
+@pytest.mark.parametrize("cypher", [
+    "MATCH (n) DETACH DELETE n",
+    "MATCH (n) SET n.flag = true RETURN n",
+    "MATCH (n) REMOVE n.flag RETURN n",
+    "CREATE (n:Company {name: 'X'})",
+    "MERGE (n:Company {name: 'X'}) RETURN n",
+    "LOAD CSV FROM 'file:///x.csv' AS row RETURN row",
+])
+def test_rejects_write_clauses(cypher):
+    with pytest.raises(CypherRejected, match="write clause"):
+        check_cypher(cypher)
+
+
+@pytest.mark.parametrize("cypher", [
+    "MATCH (n) RETURN n.name AS set",
+    "MATCH (n) RETURN n.set, n.remove",
+    "MATCH (n) WHERE n.name = 'CREATE' RETURN n.name",
+    "MATCH (n) RETURN n.`delete`",
+])
+def test_allows_keywords_that_are_not_clauses(cypher):
+    check_cypher(cypher)
+
+
+@pytest.mark.parametrize("pattern", ["*", "*2..", f"*{MAX_HOPS + 1}", f"*1..{MAX_HOPS + 1}"])
+def test_rejects_unbounded_or_deep_paths(pattern):
+    with pytest.raises(CypherRejected, match="variable-length path"):
+        check_cypher(f"MATCH (a)-[:PARTNERS_WITH{pattern}]->(b) RETURN b.name")
+
+
+@pytest.mark.parametrize("pattern", ["*1..2", f"*{MAX_HOPS}", f"*..{MAX_HOPS}"])
+def test_allows_bounded_paths(pattern):
+    check_cypher(f"MATCH (a)-[:PARTNERS_WITH{pattern}]->(b) RETURN b.name")
+
+
+def test_allows_read_procedures():
+    assert check_cypher("CALL db.labels()") == "CALL db.labels()"
+
+
+@pytest.mark.parametrize("cypher", [
+    "CALL apoc.periodic.iterate('MATCH (n) RETURN n', 'DETACH DELETE n', {})",
+    "CALL dbms.killQueries(['1'])",
+])
+def test_rejects_other_procedures(cypher):
+    with pytest.raises(CypherRejected, match="procedure"):
+        check_cypher(cypher)
+
+
+def test_rejects_empty_query():
+    with pytest.raises(CypherRejected, match="empty"):
+        check_cypher("  // nothing here\n;")
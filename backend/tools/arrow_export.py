@@ -0,0 +1,199 @@
+"""
+Arrow export — columnar Parquet / Arrow IPC files for nodes, edges and per-company
+extractions. Labels, relationship types and categories are dictionary-encoded, and
+rows are written in record batches as they stream out of Neo4j (or the memory graph).
+
+    python -m tools.arrow_export --out exports/ --format arrow
+"""
+import argparse
+import asyncio
+import importlib.util
+import logging
+import os
+import tempfile
+import zipfile
+from config import settings
+from graph.neo4j_client import neo4j_client
+from graph.memory_graph import memory_graph
+from graph.graph_stream import iter_nodes, iter_edges
+from agents.extraction_store import extraction_store
+
+logger = logging.getLogger(__name__)
+
+ARROW_TABLES = ("nodes", "edges", "extractions")
+ARROW_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}  # .arrow = uncompressed IPC file, memory-mappable
+EXPORT_DIR = os.path.join(settings.CACHE_DIR, "exports")
+
+
+def is_available() -> bool:
+    """pyarrow is optional; columnar exports are disabled without it."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _pyarrow():
+    # Imported on first export rather than at boot: pyarrow is slow to import
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    return pa, pq
+
+
+# ------------------------------------------------------------------ sources
+async def _graph_vocabularies() -> dict[str, list[str]]:
+    if not neo4j_client.is_connected:
+        return {"label": sorted(memory_graph.labels), "relationship": sorted(memory_graph.relationship_types)}
+    labels = await neo4j_client.run_query("CALL db.labels() YIELD label RETURN label")
+    rels = await neo4j_client.run_query("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType AS rel")
+    return {"label": sorted(r["label"] for r in labels), "relationship": sorted(r["rel"] for r in rels)}
+
+
+async def _node_rows():
+    async for node in iter_nodes():
+        yield node["name"], node["label"]
+
+
+async def _edge_rows():
+    async for edge in iter_edges():
+        yield edge["source"], edge["relationship"], edge["target"]
+
+
+async def _extraction_rows(rows: list[tuple]):
+    for row in rows:
+        yield row
+
+
+async def _table_source(table: str):
+    """Return (columns, dictionary vocabularies, async row iterator) for *table*."""
+    if table == "nodes":
+        vocab = await _graph_vocabularies()
+        return ["name", "label"], {"label": vocab["label"]}, _node_rows()
+    if table == "edges":
+        vocab = await _graph_vocabularies()
+        return ["source", "relationship", "target"], {"relationship": vocab["relationship"]}, _edge_rows()
+    rows = list(extraction_store.rows())
+    vocab = {"company": sorted({r[0] for r in rows}), "category": sorted({r[1] for r in rows})}
+    return ["company", "category", "value", "details"], vocab, _extraction_rows(rows)
+
+
+# ------------------------------------------------------------------ batches
+class _BatchBuilder:
+    """Builds record batches whose dictionary columns all share one fixed dictionary.
+
+    The Arrow IPC file format does not allow a dictionary to change between batches,
+    so vocabularies are fixed up front; a value outside its vocabulary (e.g. a label
+    written while the export runs) comes out null.
+    """
+
+    def __init__(self, columns: list[str], vocab: dict[str, list[str]]):
+        self.pa = pa = _pyarrow()[0]
+        self.columns = columns
+        self.schema = pa.schema([
+            pa.field(c, pa.dictionary(pa.int32(), pa.string()) if c in vocab else pa.string())
+            for c in columns
+        ])
+        self._dicts = {
+            c: (pa.array(values, pa.string()), {v: i for i, v in enumerate(values)})
+            for c, values in vocab.items()
+        }
+
+    def build(self, rows: list[tuple]):
+        pa = self.pa
+        arrays = []
+        for i, column in enumerate(self.columns):
+            values = [row[i] for row in rows]
+            if column in self._dicts:
+                dictionary, index = self._dicts[column]
+                indices = pa.array([index.get(v) for v in values], pa.int32())
+                arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+            else:
+                arrays.append(pa.array(values, pa.string()))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+async def write_table(table: str, path: str, fmt: str = "parquet", batch_rows: int | None = None) -> int:
+    """Write *table* to *path* as Parquet or an Arrow IPC file. Returns the row count."""
+    if not is_available():
+        raise RuntimeError("pyarrow is not installed")
+    if table not in ARROW_TABLES:
+        raise ValueError(f"Unknown table: {table}. Use {', '.join(ARROW_TABLES)}.")
+    if fmt not in ARROW_FORMATS:
+        raise ValueError(f"Unknown format: {fmt}. Use {', '.join(ARROW_FORMATS)}.")
+    batch_rows = batch_rows or settings.EXPORT_BATCH_ROWS
+
+    columns, vocab, rows = await _table_source(table)
+    builder = _BatchBuilder(columns, vocab)
+    pa, pq = _pyarrow()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(path, builder.schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(path, builder.schema)
+
+    count, batch = 0, []
+    try:
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                await asyncio.to_thread(writer.write_batch, builder.build(batch))
+                count, batch = count + len(batch), []
+        if batch:
+            await asyncio.to_thread(writer.write_batch, builder.build(batch))
+            count += len(batch)
+    finally:
+        writer.close()
+    logger.info("Exported %s: %d rows -> %s", table, count, path)
+    return count
+
+
+async def build_export(tables: list[str], fmt: str = "parquet") -> tuple[str, str]:
+    """Write the requested tables to a temporary file (a zip for several tables).
+
+    Returns (path, download filename); the caller deletes the file once it is sent.
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    ext = ARROW_FORMATS.get(fmt, "")
+    paths = []
+    try:
+        for table in tables:
+            fd, path = tempfile.mkstemp(suffix=ext, dir=EXPORT_DIR)
+            os.close(fd)
+            paths.append(path)
+            await write_table(table, path, fmt)
+        if len(tables) == 1:
+            return paths.pop(), f"{tables[0]}{ext}"
+
+        fd, archive = tempfile.mkstemp(suffix=".zip", dir=EXPORT_DIR)
+        os.close(fd)
+
+        def _zip():
+            # Parquet is already compressed and .arrow files are meant to be mapped as-is
+            with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zf:
+                for table, path in zip(tables, paths):
+                    zf.write(path, f"{table}{ext}")
+
+        await asyncio.to_thread(_zip)
+        return archive, f"knowledge_graph_{fmt}.zip"
+    finally:
+        for path in paths:
+            os.remove(path)
+
+
+# ------------------------------------------------------------------ CLI
+async def _main(args):
+    await neo4j_client.connect()
+    try:
+        os.makedirs(args.out, exist_ok=True)
+        for table in args.tables.split(","):
+            path = os.path.join(args.out, f"{table}{ARROW_FORMATS[args.format]}")
+            count = await write_table(table, path, args.format, args.batch_rows)
+            print(f"{table}: {count} rows -> {path}")
+    finally:
+        await neo4j_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the knowledge graph as Parquet or Arrow files.")
+    parser.add_argument("--out", default="exports", help="output directory")
+    parser.add_argument("--format", choices=list(ARROW_FORMATS), default="parquet")
+    parser.add_argument("--tables", default=",".join(ARROW_TABLES), help="comma-separated: nodes,edges,extractions")
+    parser.add_argument("--batch-rows", type=int, default=None, help="rows per record batch")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
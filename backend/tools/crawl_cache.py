@@ -0,0 +1,36 @@
+"""
+Crawl cache — persistent cache of search and IR responses keyed by URL + query.
+Stale entries keep their ETag / Last-Modified so they can be revalidated.
+"""
+import os
+from config import settings
+from tools.disk_cache import DiskCache
+
+crawl_cache = DiskCache(
+    "crawl",
+    os.path.join(settings.CACHE_DIR, "crawl"),
+    settings.CRAWL_CACHE_MAX_BYTES,
+)
+
+
+def validators(headers) -> dict:
+    """Pick the revalidation headers worth keeping from a response."""
+    meta = {}
+    if headers.get("etag"):
+        meta["etag"] = headers["etag"]
+    if headers.get("last-modified"):
+        meta["last_modified"] = headers["last-modified"]
+    return meta
+
+
+def conditional_headers(entry: dict | None) -> dict:
+    """Build If-None-Match / If-Modified-Since headers for a stale entry."""
+    if not entry:
+        return {}
+    meta = entry.get("meta", {})
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
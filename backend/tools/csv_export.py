@@ -0,0 +1,80 @@
+"""
+CSV export — generator-based CSV writer for the comparison table, the graph
+edge list and per-company extractions, with optional streaming gzip.
+Rows are encoded as they are produced, so no table is held in memory twice.
+"""
+import csv
+import io
+import zlib
+from agents.orchestrator import DEMO_COMPARISON
+from agents.extraction_store import extraction_store
+from graph.graph_stream import iter_edges
+
+CSV_TABLES = ("comparison", "edges", "extractions")
+CHUNK_BYTES = 64 * 1024
+
+
+# ------------------------------------------------------------------ tables
+async def _comparison_rows():
+    if not DEMO_COMPARISON:
+        return
+    headers = list(DEMO_COMPARISON[0].keys())
+    yield headers
+    for row in DEMO_COMPARISON:
+        yield [row.get(h, "") for h in headers]
+
+
+async def _edge_rows():
+    yield ["source", "relationship", "target"]
+    async for edge in iter_edges():
+        yield [edge["source"], edge["relationship"], edge["target"]]
+
+
+async def _extraction_rows():
+    yield ["company", "category", "value", "details"]
+    for row in extraction_store.rows():
+        yield list(row)
+
+
+_TABLE_ROWS = {
+    "comparison": _comparison_rows,
+    "edges": _edge_rows,
+    "extractions": _extraction_rows,
+}
+
+
+# ------------------------------------------------------------------ writer
+async def _csv_chunks(tables: list[str]):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for i, table in enumerate(tables):
+        if len(tables) > 1:
+            if i:
+                writer.writerow([])
+            writer.writerow([f"# {table}"])
+        async for row in _TABLE_ROWS[table]():
+            writer.writerow(row)
+            if buf.tell() >= CHUNK_BYTES:
+                yield buf.getvalue().encode("utf-8")
+                buf.seek(0)
+                buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+async def _gzipped(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_csv(tables: list[str], gzip: bool = False):
+    """Stream the selected tables as CSV; several tables are written as '# name' sections."""
+    unknown = [t for t in tables if t not in _TABLE_ROWS]
+    if unknown:
+        raise ValueError(f"Unknown CSV table(s): {', '.join(unknown)}. Use {', '.join(CSV_TABLES)}.")
+    chunks = _csv_chunks(tables)
+    return _gzipped(chunks) if gzip else chunks
@@ -0,0 +1,127 @@
+"""
+Disk cache — size-bounded, LRU-evicted JSON store on the local filesystem.
+Each entry lives in its own file named by the SHA-256 of its key.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    def __init__(self, name: str, directory: str, max_bytes: int):
+        self.name = name
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+        self._index: OrderedDict[str, int] = OrderedDict()  # key -> size, least recent first
+        self._bytes = 0
+        self.on_remove = None  # optional callback(key) for entries evicted, dropped or deleted
+        self._load_index()
+
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def key(*parts) -> str:
+        return hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for fname in os.listdir(self.directory):
+            if fname.endswith(".json"):
+                st = os.stat(os.path.join(self.directory, fname))
+                files.append((st.st_mtime, fname[:-5], st.st_size))
+        for _, key, size in sorted(files):
+            self._index[key] = size
+            self._bytes += size
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self.counters["evictions"] += 1
+            self._remove_file(key)
+
+    def _remove_file(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        if self.on_remove:
+            self.on_remove(key)
+
+    # ------------------------------------------------------------------ #
+    def get(self, key: str) -> dict | None:
+        """Return the stored entry ({stored_at, payload, meta}) or None. Does not count hits."""
+        if key not in self._index:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._bytes -= self._index.pop(key)
+            self._remove_file(key)
+            return None
+        self._index.move_to_end(key)
+        os.utime(self._path(key))
+        return entry
+
+    def meta(self):
+        """Yield (key, meta) for every entry, without touching recency."""
+        for key in list(self._index):
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    yield key, json.load(f).get("meta", {})
+            except (OSError, ValueError):
+                continue
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def delete(self, key: str):
+        if key in self._index:
+            self._bytes -= self._index.pop(key)
+            self._remove_file(key)
+
+    def put(self, key: str, payload, meta: dict | None = None) -> dict:
+        entry = {"stored_at": time.time(), "payload": payload, "meta": meta or {}}
+        data = json.dumps(entry).encode("utf-8")
+        tmp = self._path(key) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._path(key))
+        self._bytes += len(data) - self._index.pop(key, 0)
+        self._index[key] = len(data)
+        self._evict()
+        return entry
+
+    def refresh(self, key: str, entry: dict) -> dict:
+        """Re-store an entry with a new timestamp (e.g. after a 304 revalidation)."""
+        self.counters["revalidated"] += 1
+        return self.put(key, entry["payload"], entry.get("meta"))
+
+    @staticmethod
+    def is_fresh(entry: dict, ttl: float) -> bool:
+        return time.time() - entry["stored_at"] < ttl
+
+    def hit(self):
+        self.counters["hits"] += 1
+
+    def miss(self):
+        self.counters["misses"] += 1
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["revalidated"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "entries": len(self._index),
+            "bytes": self._bytes,
+            "hit_rate": round((self.counters["hits"] + self.counters["revalidated"]) / lookups, 3) if lookups else 0.0,
+        }
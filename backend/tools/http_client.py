@@ -0,0 +1,107 @@
+"""
+HTTP client — process-wide pooled httpx client shared by all crawling tools.
+Adds retries with jittered exponential backoff and a per-host request rate limit.
+"""
+import asyncio
+import logging
+import random
+import time
+from urllib.parse import urlparse
+import httpx
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HttpClient:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._client = None
+            cls._instance._host_locks = {}
+            cls._instance._host_next = {}
+        return cls._instance
+
+    # ------------------------------------------------------------------ #
+    def start(self):
+        if self._client is not None:
+            return
+        http2 = settings.HTTP2 and _http2_available()
+        self._client = httpx.AsyncClient(
+            timeout=settings.HTTP_TIMEOUT,
+            follow_redirects=True,
+            http2=http2,
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        logger.info("HTTP client started (http2=%s, max_connections=%d)", http2, settings.HTTP_MAX_CONNECTIONS)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def is_started(self) -> bool:
+        return self._client is not None
+
+    # ------------------------------------------------------------------ #
+    async def _throttle(self, url: str):
+        """Space out requests to the same host to at most HTTP_HOST_RATE per second."""
+        if settings.HTTP_HOST_RATE <= 0:
+            return
+        host = urlparse(url).netloc
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            wait = self._host_next.get(host, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_next[host] = time.monotonic() + 1.0 / settings.HTTP_HOST_RATE
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return settings.HTTP_BACKOFF_BASE * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the shared pool, retrying transient failures."""
+        if self._client is None:
+            self.start()
+        attempts = settings.HTTP_RETRIES + 1
+        for attempt in range(attempts):
+            await self._throttle(url)
+            try:
+                resp = await self._client.request(method, url, **kwargs)
+                if resp.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                    return resp
+                logger.debug("%s %s returned %d — retrying", method, url, resp.status_code)
+            except httpx.TransportError as exc:
+                if attempt == attempts - 1:
+                    raise
+                logger.debug("%s %s failed (%s) — retrying", method, url, exc)
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+
+http_client = HttpClient()
@@ -1,9 +1,10 @@
 """
 IR Scraper — BeautifulSoup-based scraper for investor-relations pages.
 """
-import httpx
 import logging
-from bs4 import BeautifulSoup
+from config import settings
+from tools.http_client import http_client
+from tools.crawl_cache import crawl_cache, conditional_headers, validators
 
 logger = logging.getLogger(__name__)
 
@@ -17,20 +18,36 @@ IR_URLS = {
 
 
 async def scrape_ir(company: str) -> dict:
-    """Scrape investor relations page for a company. Returns {company, url, content}."""
+    """Scrape investor relations page for a company. Returns {company, url, content}.
+
+    Results are cached for CRAWL_IR_TTL; stale entries are revalidated with
+    ETag / Last-Modified so an unchanged page costs a 304 instead of a re-parse.
+    """
     url = IR_URLS.get(company, "")
     if not url:
         return {"company": company, "url": "", "content": "", "error": "No IR URL configured"}
+    key = crawl_cache.key("ir", url)
+    entry = crawl_cache.get(key)
+    if entry and crawl_cache.is_fresh(entry, settings.CRAWL_IR_TTL):
+        crawl_cache.hit()
+        return entry["payload"]
     try:
-        async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
-            resp = await client.get(url, headers={"User-Agent": "Mozilla/5.0"})
-            resp.raise_for_status()
+        resp = await http_client.get(url, headers=conditional_headers(entry), timeout=20)
+        if resp.status_code == 304 and entry:
+            crawl_cache.refresh(key, entry)
+            return entry["payload"]
+        crawl_cache.miss()
+        resp.raise_for_status()
+        from bs4 import BeautifulSoup  # imported on first use (or during warm-up) to keep boot fast
         soup = BeautifulSoup(resp.text, "lxml")
         # Remove scripts/styles
         for tag in soup(["script", "style", "nav", "footer", "header"]):
             tag.decompose()
         text = soup.get_text(separator="\n", strip=True)[:5000]
-        return {"company": company, "url": url, "content": text}
+        result = {"company": company, "url": url, "content": text}
+        if text:
+            crawl_cache.put(key, result, validators(resp.headers))
+        return result
     except Exception as exc:
         logger.warning("IR scrape failed for %s: %s", company, exc)
         return {"company": company, "url": url, "content": "", "error": str(exc)}
@@ -1,6 +1,7 @@
 """
 MCP Tool Server — exposes intelligence tools as an MCP-compatible layer.
-Each tool returns structured JSON.
+Each tool returns structured JSON. Network-backed tools share the pooled
+client in tools.http_client.
 """
 import logging
 from tools.web_search_tool import web_search
@@ -0,0 +1,186 @@
+"""
+PDF report — renders the executive summary PDF in a worker process and caches
+the artifact on disk, keyed by a hash of the content it renders.
+"""
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = os.path.join(settings.CACHE_DIR, "reports")
+REPORT_LAYOUT_VERSION = 1  # bump when render_pdf changes, to invalidate cached reports
+
+_executor: ProcessPoolExecutor | None = None
+_rendering: dict[str, asyncio.Future] = {}
+_background: set[asyncio.Task] = set()
+
+
+def render_pdf(summary: dict, comparison: list[dict]) -> bytes:
+    """Build the executive summary PDF. Runs in a worker process."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.colors import HexColor
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.units import inch
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75 * inch, bottomMargin=0.75 * inch)
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Title
+    title_style = ParagraphStyle("Title", parent=styles["Title"], textColor=HexColor("#7c3aed"), fontSize=18)
+    story.append(Paragraph(summary["title"], title_style))
+    story.append(Spacer(1, 20))
+
+    # Strategic Positioning
+    story.append(Paragraph("<b>Strategic Positioning</b>", styles["Heading2"]))
+    story.append(Paragraph(summary["strategic_positioning"], styles["Normal"]))
+    story.append(Spacer(1, 12))
+
+    # Strengths
+    story.append(Paragraph("<b>Strengths</b>", styles["Heading2"]))
+    for s in summary["strengths"]:
+        story.append(Paragraph(f"• {s}", styles["Normal"]))
+    story.append(Spacer(1, 12))
+
+    # Weaknesses
+    story.append(Paragraph("<b>Weaknesses</b>", styles["Heading2"]))
+    for w in summary["weaknesses"]:
+        story.append(Paragraph(f"• {w}", styles["Normal"]))
+    story.append(Spacer(1, 12))
+
+    # Risk
+    story.append(Paragraph("<b>Risk Outlook</b>", styles["Heading2"]))
+    risk = summary["risk_outlook"]
+    story.append(Paragraph(f"Overall Risk: {risk['overall_risk']} (Score: {risk['risk_score']}/100)", styles["Normal"]))
+    for t in risk["primary_threats"]:
+        story.append(Paragraph(f"⚠ {t}", styles["Normal"]))
+    story.append(Spacer(1, 12))
+
+    # Comparison Table
+    story.append(Paragraph("<b>Comparison Table</b>", styles["Heading2"]))
+    if comparison:
+        headers = list(comparison[0].keys())
+        table_data = [headers] + [[row[h] for h in headers] for row in comparison]
+        t = Table(table_data, repeatRows=1)
+        t.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), HexColor("#7c3aed")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), HexColor("#ffffff")),
+            ("FONTSIZE", (0, 0), (-1, -1), 7),
+            ("GRID", (0, 0), (-1, -1), 0.5, HexColor("#cccccc")),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [HexColor("#f8f7ff"), HexColor("#ffffff")]),
+        ]))
+        story.append(t)
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+# ------------------------------------------------------------------ cache
+def report_key(summary: dict, comparison: list[dict]) -> str:
+    """Hash of everything the PDF shows, so the same report is reused across restarts."""
+    payload = json.dumps([REPORT_LAYOUT_VERSION, summary, comparison], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn, not fork: the pool starts while warm-up threads may be holding locks
+        _executor = ProcessPoolExecutor(max_workers=settings.PDF_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def _load_reportlab():
+    import reportlab.platypus  # noqa: F401
+
+
+async def prewarm():
+    """Start the worker processes and import reportlab in them ahead of the first render."""
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    await asyncio.gather(*(loop.run_in_executor(executor, _load_reportlab) for _ in range(settings.PDF_WORKERS)))
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _write_artifact(path: str, data: bytes):
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    # Keep only the most recent artifacts
+    files = sorted(
+        (os.path.join(REPORT_DIR, f) for f in os.listdir(REPORT_DIR) if f.endswith(".pdf")),
+        key=os.path.getmtime,
+    )
+    for old in files[:-settings.REPORT_CACHE_MAX_FILES]:
+        try:
+            os.remove(old)
+        except FileNotFoundError:
+            pass
+
+
+def _read_artifact(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)  # mark as recently used, so eviction drops the least recently used
+    except FileNotFoundError:
+        return None
+    return data
+
+
+async def _render(key: str, path: str, summary: dict, comparison: list[dict]) -> bytes:
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(_get_executor(), render_pdf, summary, comparison)
+    await asyncio.to_thread(_write_artifact, path, data)
+    logger.info("Rendered report %s (%d bytes)", key[:12], len(data))
+    return data
+
+
+async def get_report_pdf(summary: dict, comparison: list[dict]) -> bytes:
+    """Return the PDF for this summary/comparison from the disk cache, rendering it if needed.
+
+    The bytes are returned rather than the path, so evicting an artifact can never
+    break a download that is still being sent.
+    """
+    key = report_key(summary, comparison)
+    path = os.path.join(REPORT_DIR, f"{key}.pdf")
+    data = await asyncio.to_thread(_read_artifact, path)
+    if data is not None:
+        return data
+    if key not in _rendering:
+        # Concurrent downloads of the same report share one render
+        _rendering[key] = asyncio.ensure_future(_render(key, path, summary, comparison))
+        _rendering[key].add_done_callback(lambda _: _rendering.pop(key, None))
+    return await asyncio.shield(_rendering[key])
+
+
+async def _prerender(summary: dict, comparison: list[dict]):
+    try:
+        await get_report_pdf(summary, comparison)
+    except Exception as exc:
+        logger.warning("Report pre-render failed: %s", exc)
+
+
+def schedule_prerender(summary: dict, comparison: list[dict]):
+    """Render the report in the background ahead of the first download."""
+    task = asyncio.create_task(_prerender(summary, comparison))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
@@ -1,8 +1,10 @@
 """
-Web search tool — lightweight DuckDuckGo search via httpx.
+Web search tool — lightweight DuckDuckGo search via the shared HTTP client.
 """
-import httpx
 import logging
+from config import settings
+from tools.http_client import http_client
+from tools.crawl_cache import crawl_cache
 
 logger = logging.getLogger(__name__)
 
@@ -10,11 +12,16 @@ SEARCH_URL = "https://html.duckduckgo.com/html/"
 
 
 async def web_search(query: str, max_results: int = 5) -> list[dict]:
-    """Search DuckDuckGo and return list of {title, url, snippet}."""
+    """Search DuckDuckGo and return list of {title, url, snippet}. Cached for CRAWL_NEWS_TTL."""
+    key = crawl_cache.key("news", SEARCH_URL, query, max_results)
+    entry = crawl_cache.get(key)
+    if entry and crawl_cache.is_fresh(entry, settings.CRAWL_NEWS_TTL):
+        crawl_cache.hit()
+        return entry["payload"]
+    crawl_cache.miss()
     try:
-        async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
-            resp = await client.post(SEARCH_URL, data={"q": query, "b": ""})
-            resp.raise_for_status()
+        resp = await http_client.post(SEARCH_URL, data={"q": query, "b": ""}, timeout=15)
+        resp.raise_for_status()
 
         from bs4 import BeautifulSoup
         soup = BeautifulSoup(resp.text, "html.parser")
@@ -28,6 +35,8 @@ async def web_search(query: str, max_results: int = 5) -> list[dict]:
                     "url": title_el.get("href", ""),
                     "snippet": snippet_el.get_text(strip=True) if snippet_el else "",
                 })
+        if results:
+            crawl_cache.put(key, results)
         return results
     except Exception as exc:
         logger.warning("Web search failed: %s", exc)
@@ -10,13 +10,46 @@ const api = axios.create({
 
 export const getHealth = () => api.get('/health');
 export const getCohort = () => api.get('/cohort');
+// Queues a background pipeline run; resolves with { job_id, status, ... }
 export const runAnalysis = (query) => api.post(`/analyze?query=${encodeURIComponent(query)}`);
-export const getGraph = (company) => api.get('/graph', { params: company ? { company } : {} });
+export const getJob = (jobId) => api.get(`/jobs/${jobId}`);
+export const getJobResult = (jobId) => api.get(`/jobs/${jobId}/result`);
+export const cancelJob = (jobId) => api.delete(`/jobs/${jobId}`);
+
+// Server-Sent Events variant of /analyze. Handlers receive parsed event payloads;
+// returns the EventSource so callers can close it early.
+export const streamAnalysis = (query, { onStatus, onCrawl, onExtraction, onReasoning, onResult, onError } = {}) => {
+    const source = new EventSource(`${API_BASE}/analyze/stream?query=${encodeURIComponent(query)}`);
+    const on = (event, handler) => source.addEventListener(event, (e) => handler?.(JSON.parse(e.data)));
+    on('status', onStatus);
+    on('crawl', onCrawl);
+    on('extraction', onExtraction);
+    on('reasoning', onReasoning);
+    on('result', (data) => { source.close(); onResult?.(data); });
+    source.onerror = (err) => { source.close(); onError?.(err); };
+    return source;
+};
+// Returns one page: { nodes, edges, next_cursor }. Pass next_cursor back as `cursor` for the next page.
+export const getGraph = (company, { cursor, pageSize, labels, relTypes } = {}) => api.get('/graph', {
+    params: {
+        ...(company ? { company } : {}),
+        ...(cursor ? { cursor } : {}),
+        ...(pageSize ? { page_size: pageSize } : {}),
+        ...(labels ? { labels: labels.join(',') } : {}),
+        ...(relTypes ? { rel_types: relTypes.join(',') } : {}),
+    },
+});
 export const queryGraph = (question) => api.post(`/graph/query?question=${encodeURIComponent(question)}`);
 export const getCommonPartners = (a, b) => api.get('/graph/common-partners', { params: { company_a: a, company_b: b } });
+export const getCommonPartnersMatrix = (companies, relTypes) => api.get('/graph/common-partners/matrix', {
+    params: { companies: companies?.join(','), rel_types: relTypes?.join(',') },
+});
 export const getExposure = (entity) => api.get('/graph/exposure', { params: { entity } });
 export const getComparison = () => api.get('/comparison');
 export const getSummary = () => api.get('/summary');
-export const exportData = (fmt) => api.get(`/export/${fmt}`, { responseType: fmt === 'pdf' ? 'blob' : 'json' });
+export const exportData = (fmt, params = {}) => api.get(`/export/${fmt}`, {
+    params,
+    responseType: fmt === 'pdf' || fmt === 'csv' ? 'blob' : 'json',
+});
 
 export default api;
@@ -3,7 +3,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import GraphView from '../components/GraphView';
 import ComparisonTable from '../components/ComparisonTable';
 import ExecutiveSummary from '../components/ExecutiveSummary';
-import { runAnalysis, getGraph, getComparison, getSummary, exportData } from '../api';
+import { streamAnalysis, getGraph, getComparison, getSummary, exportData } from '../api';
 import { FiSearch, FiZap, FiActivity, FiDownload } from 'react-icons/fi';
 
 const QUICK_QUERIES = [
@@ -14,6 +14,33 @@ const QUICK_QUERIES = [
     "Who has more NVIDIA exposure?",
 ];
 
+const PIPELINE_STEPS = [
+    { status: 'crawling', label: 'Crawling' },
+    { status: 'extracting', label: 'Extracting' },
+    { status: 'building_graph', label: 'Building Graph' },
+    { status: 'reasoning', label: 'Reasoning' },
+    { status: 'generating_summary', label: 'Summarizing' },
+];
+
+const mergeGraphPage = (prev, page) => {
+    if (!prev) return page;
+    const seen = new Set(prev.nodes.map((n) => n.id));
+    return {
+        nodes: [...prev.nodes, ...page.nodes.filter((n) => !seen.has(n.id))],
+        edges: [...prev.edges, ...page.edges],
+        next_cursor: page.next_cursor,
+    };
+};
+
+const runStreamedAnalysis = (query, onStatus, onCompany) => new Promise((resolve, reject) => {
+    streamAnalysis(query, {
+        onStatus: ({ status }) => onStatus(status),
+        onCrawl: (data) => onCompany(data.company),
+        onResult: (data) => resolve({ data }),
+        onError: reject,
+    });
+});
+
 export default function Dashboard() {
     const [query, setQuery] = useState('');
     const [loading, setLoading] = useState(false);
@@ -22,19 +49,33 @@ export default function Dashboard() {
     const [comparison, setComparison] = useState(null);
     const [summary, setSummary] = useState(null);
     const [activeTab, setActiveTab] = useState('graph');
+    const [stage, setStage] = useState(null);
+    const [crawled, setCrawled] = useState([]);
+
+    // Fetch the remaining graph pages in the background and append them as they arrive
+    const loadRemainingGraph = async (cursor) => {
+        while (cursor) {
+            const { data: page } = await getGraph(null, { cursor });
+            setGraphData((prev) => mergeGraphPage(prev, page));
+            cursor = page.next_cursor;
+        }
+    };
 
     const handleAnalyze = async () => {
         if (!query.trim()) return;
         setLoading(true);
+        setStage(null);
+        setCrawled([]);
         try {
             const [analysisRes, graphRes, compRes, summRes] = await Promise.all([
-                runAnalysis(query),
+                runStreamedAnalysis(query, setStage, (company) => setCrawled((prev) => [...prev, company])),
                 getGraph(),
                 getComparison(),
                 getSummary(),
             ]);
             setResults(analysisRes.data);
             setGraphData(graphRes.data);
+            loadRemainingGraph(graphRes.data.next_cursor).catch((e) => console.error('Graph paging failed:', e));
             setComparison(compRes.data.comparison);
             setSummary(summRes.data);
         } catch (err) {
@@ -61,8 +102,7 @@ export default function Dashboard() {
     const handleExportCSV = async () => {
         try {
             const res = await exportData('csv');
-            const blob = new Blob([JSON.stringify(res.data)], { type: 'text/csv' });
-            const url = URL.createObjectURL(blob);
+            const url = URL.createObjectURL(res.data);
             const a = document.createElement('a');
             a.href = url;
             a.download = 'comparison_table.csv';
@@ -202,19 +242,27 @@ export default function Dashboard() {
                             <span>Running intelligence pipeline...</span>
                         </div>
                         <div className="flex gap-2 mt-2">
-                            {['Crawling', 'Extracting', 'Building Graph', 'Reasoning', 'Summarizing'].map((step, i) => (
+                            {PIPELINE_STEPS.map((step, i) => (
                                 <motion.span
-                                    key={step}
+                                    key={step.status}
                                     initial={{ opacity: 0.3 }}
-                                    animate={{ opacity: [0.3, 1, 0.3] }}
-                                    transition={{ delay: i * 0.8, duration: 2, repeat: Infinity }}
+                                    animate={{ opacity: stage === step.status ? [0.3, 1, 0.3] : 0.3 }}
+                                    transition={{ delay: stage ? 0 : i * 0.8, duration: 2, repeat: Infinity }}
                                     className="text-xs px-2 py-1 rounded"
-                                    style={{ background: 'rgba(124,58,237,0.1)', color: '#94a3b8' }}
+                                    style={{
+                                        background: stage === step.status ? 'rgba(124,58,237,0.3)' : 'rgba(124,58,237,0.1)',
+                                        color: stage === step.status ? '#c084fc' : '#94a3b8',
+                                    }}
                                 >
-                                    {step}
+                                    {step.label}
                                 </motion.span>
                             ))}
                         </div>
+                        {crawled.length > 0 && (
+                            <div className="text-xs" style={{ color: '#64748b' }}>
+                                Crawled: {crawled.join(', ')}
+                            </div>
+                        )}
                     </motion.div>
                 )}
             </AnimatePresence>